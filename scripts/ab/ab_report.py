@@ -62,7 +62,7 @@ def mk_md(date_label, a, b, reduction_count, reduction_unique, new_in_b):
     return "\n".join(md)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Generate daily A/B report (JSON + Markdown)")
     ap.add_argument('--in-a', required=True)
     ap.add_argument('--in-b', required=True)
@@ -70,7 +70,7 @@ def main() -> int:
     ap.add_argument('--dup-key', default='rule_id,entity_id,time_bucket')
     ap.add_argument('--bucket-minutes', type=int, default=60)
     ap.add_argument('--date-label', default=None)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     out_dir = pathlib.Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -11,14 +11,14 @@ def assign_arm(stable_key: str, salt: str) -> str:
     return 'A' if int(h, 16) % 2 == 0 else 'B'
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Deterministic A/B assignment")
     ap.add_argument('--in', dest='inp', required=True, help='input JSONL path')
     ap.add_argument('--out-dir', required=True, help='output dir; creates A.jsonl/B.jsonl with arm field')
     ap.add_argument('--key-fields', default='entity_id,rule_id',
                     help='comma-separated fields used for deterministic assignment')
     ap.add_argument('--salt', default='BOLCD_AB_v1', help='salt string for hashing')
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     in_path = pathlib.Path(args.inp)
     out_dir = pathlib.Path(args.out_dir)
@@ -4,11 +4,11 @@ import json
 import pathlib
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Aggregate daily AB json files into a weekly summary")
     ap.add_argument('--dir', required=True)
     ap.add_argument('--out', required=True)
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     d = pathlib.Path(args.dir)
     days = sorted(d.glob("ab_*.json"))
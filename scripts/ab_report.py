@@ -143,13 +143,13 @@ def write_reports(summary: Dict[str, Any], out_prefix: Path) -> None:
     (out_prefix.with_suffix(".md")).write_text("\n".join(md_lines), encoding="utf-8")
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     p = argparse.ArgumentParser(description="Compute A/B deltas from JSONL dumps")
     p.add_argument("--a", required=True, help="Path to A (control) JSONL")
     p.add_argument("--b", required=True, help="Path to B (treatment) JSONL")
     p.add_argument("--keys", nargs="*", help="Signature keys (default: all minus timestamp common fields)")
     p.add_argument("--out-prefix", default="reports/ab_report", help="Output prefix for .json/.md")
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     a_rows = read_jsonl(Path(args.a))
     b_rows = read_jsonl(Path(args.b))
@@ -90,7 +90,7 @@ def daterange(start: date, end: date) -> Iterable[date]:
         d += timedelta(days=1)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     p = argparse.ArgumentParser(description="Aggregate daily A/B JSONL results into a weekly report")
     p.add_argument("--prefix-a", required=True, help="Prefix for A files, e.g., data/raw/splunk_A_")
     p.add_argument("--prefix-b", required=True, help="Prefix for B files, e.g., data/raw/splunk_B_")
@@ -98,7 +98,7 @@ def main() -> None:
     p.add_argument("--end", required=False, help="End date YYYY-MM-DD (default: today)")
     p.add_argument("--keys", nargs="*", help="Signature keys (optional)")
     p.add_argument("--out-prefix", default="reports/ab_weekly", help="Output prefix for .csv/.md")
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     today = date.today()
     start = date.fromisoformat(args.start) if args.start else (today - timedelta(days=6))
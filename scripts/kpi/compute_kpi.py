@@ -57,7 +57,7 @@ def pctl(xs, q):
     return xs[idx]
 
 
-def main():
+def main(argv=None):
     ap = argparse.ArgumentParser(description="Compute daily KPI from AB reports and cases")
     ap.add_argument('--date', default=None, help='YYYY-MM-DD. Default: UTC today')
     ap.add_argument('--reports-dir', default='/reports')
@@ -67,7 +67,7 @@ def main():
     ap.add_argument('--ingest-b-gb', type=float, default=None, help='B ingest GB (optional)')
     ap.add_argument('--cost-per-gb-usd', type=float, default=None, help='SIEM $/GB (optional)')
     ap.add_argument('--out', default=None, help='output path. Default: /reports/kpi_YYYY-MM-DD.json')
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     today = args.date or datetime.date.today().isoformat()
     reports = pathlib.Path(args.reports_dir)
@@ -3,17 +3,19 @@ from __future__ import annotations
  
 import json
 import base64
+import hashlib
+import itertools
 from time import monotonic
 import logging
 import os
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import yaml
 from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, Response
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from prometheus_client import (
@@ -29,12 +31,13 @@ from bolcd.core.pipeline import (
     generate_synthetic_events,
     learn_graphs_by_segments,
 )
-from bolcd.ui.graph_export import to_graphml, write_graph_files
+from bolcd.ui.graph_export import iter_graphml, nan_to_null, write_graph_files
 from bolcd.io.jsonl import read_jsonl
 from bolcd.connectors.factory import make_connector
 from bolcd.audit.store import JSONLAuditStore, SQLiteAuditStore
 from .middleware import install_middlewares, verify_role
 from bolcd.ui.dashboard import router as dashboard_router
+from bolcd.ui.http_cache import etag_matches
 
 # Import auth routes
 try:
@@ -129,6 +132,27 @@ RATE_LIMITED_TOTAL = Counter("bolcd_rate_limited_total", "Requests rejected due
 RATE_ALLOWED_TOTAL = Counter("bolcd_rate_allowed_total", "Requests allowed after rate limiting", ["key"], registry=REGISTRY)
 
 
+def _apply_ab_effects(effects: Dict[str, Any], new_in_b_top: List[Dict[str, Any]] | None = None) -> None:
+    """Set the AB gauges from a report's effects.
+
+    When effects lack new_in_b_* the regression gauges fall back to the
+    report's top.new_in_b list.
+    """
+    AB_REDUCTION_COUNT.set(float(effects.get("reduction_by_count", 0.0)))
+    AB_REDUCTION_UNIQUE.set(float(effects.get("reduction_by_unique", 0.0)))
+    AB_SUPPRESSED_COUNT.set(float(effects.get("suppressed_count", 0.0)))
+    eff_new_in_b_unique = effects.get("new_in_b_unique")
+    eff_new_in_b_count = effects.get("new_in_b_count")
+    if eff_new_in_b_unique is not None:
+        AB_NEW_IN_B_UNIQUE.set(float(eff_new_in_b_unique))
+    else:
+        new_in_b = new_in_b_top or []
+        AB_NEW_IN_B_UNIQUE.set(float(len(new_in_b)))
+        AB_NEW_IN_B_COUNT.set(float(sum(it.get("count", 0) for it in new_in_b)))
+    if eff_new_in_b_count is not None:
+        AB_NEW_IN_B_COUNT.set(float(eff_new_in_b_count))
+
+
 def _update_ab_metrics_from_reports() -> None:
     try:
         if not BOLCD_REPORTS_DIR.exists():
@@ -147,19 +171,7 @@ def _update_ab_metrics_from_reports() -> None:
             eff = data
         else:
             eff = data.get("effects", {}) if isinstance(data, dict) else {}
-        AB_REDUCTION_COUNT.set(float(eff.get("reduction_by_count", 0.0)))
-        AB_REDUCTION_UNIQUE.set(float(eff.get("reduction_by_unique", 0.0)))
-        AB_SUPPRESSED_COUNT.set(float(eff.get("suppressed_count", 0.0)))
-        eff_new_in_b_unique = eff.get("new_in_b_unique")
-        eff_new_in_b_count = eff.get("new_in_b_count")
-        if eff_new_in_b_unique is not None:
-            AB_NEW_IN_B_UNIQUE.set(float(eff_new_in_b_unique))
-        else:
-            new_in_b = data.get("top", {}).get("new_in_b", [])
-            AB_NEW_IN_B_UNIQUE.set(float(len(new_in_b)))
-            AB_NEW_IN_B_COUNT.set(float(sum(it.get("count", 0) for it in new_in_b)))
-        if eff_new_in_b_count is not None:
-            AB_NEW_IN_B_COUNT.set(float(eff_new_in_b_count))
+        _apply_ab_effects(eff, data.get("top", {}).get("new_in_b", []))
         AB_LAST_FILE_MTIME.set(float(latest.stat().st_mtime))
     except Exception:
         # never fail metrics endpoint due to parsing errors
@@ -401,14 +413,65 @@ async def recompute(req: RecomputeRequest, request: Request, _: None = Depends(v
     return {"status": "ok", "edges": len(union["edges"]), "nodes": len(union["nodes"]), "outputs": outputs}
 
 
+_NO_GRAPHS: Dict[str, Any] = {"union": {"nodes": [], "edges": []}}
+
+
+def _graph_json(graphs: Dict[str, Any]) -> tuple[bytes, str]:
+    """JSON body and ETag for the union graph, serialized once per recompute."""
+    cached = getattr(app.state, "graph_json", None)
+    # Keyed on the graphs object itself: recompute replaces it wholesale
+    if cached is None or cached[0] is not graphs:
+        g = graphs.get("union", {"nodes": [], "edges": []})
+        # Non-finite floats (ci95_upper is NaN when k_counterex > 0) become null, as in graph.json
+        body = json.dumps(nan_to_null(g), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        cached = app.state.graph_json = (graphs, body, etag)
+    return cached[1], cached[2]
+
+
 @app.get("/api/graph")
-async def graph(format: str = "json") -> Any:
+async def graph(request: Request, format: str = "json") -> Any:
     REQ_COUNT.labels(path="/api/graph").inc()
+    graphs = getattr(app.state, "last_graphs", _NO_GRAPHS)
+    if format == "graphml":
+        g = graphs.get("union", {"nodes": [], "edges": []})
+        return StreamingResponse(iter_graphml(g), media_type="application/xml")
+    body, etag = _graph_json(graphs)
+    # no-cache: browsers keep the copy but revalidate; unchanged graphs cost a 304
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Records per chunk written by /api/graph/stream
+GRAPH_STREAM_BATCH = 2000
+
+
+def _graph_ndjson(g: Dict[str, Any]) -> Iterator[str]:
+    records = itertools.chain(
+        ({"type": "node", "id": n} for n in g.get("nodes", [])),
+        # discriminator last so an edge attribute named "type" cannot clobber it;
+        # NaN stats become null because the dashboard's JSON.parse rejects NaN
+        ({**nan_to_null(e), "type": "edge"} for e in g.get("edges", [])),
+    )
+    while True:
+        batch = [
+            json.dumps(r, allow_nan=False, separators=(",", ":"))
+            for r in itertools.islice(records, GRAPH_STREAM_BATCH)
+        ]
+        if not batch:
+            return
+        yield "\n".join(batch) + "\n"
+
+
+@app.get("/api/graph/stream")
+async def graph_stream() -> StreamingResponse:
+    """The union graph as NDJSON: node records first, then edges, sent in batches."""
+    REQ_COUNT.labels(path="/api/graph/stream").inc()
     graphs = getattr(app.state, "last_graphs", {"union": {"nodes": [], "edges": []}})
     g = graphs.get("union", {"nodes": [], "edges": []})
-    if format == "graphml":
-        return to_graphml(g)
-    return g
+    return StreamingResponse(_graph_ndjson(g), media_type="application/x-ndjson")
 
 
 @app.get("/api/audit")
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import functools
 import os
 import time
 import uuid
 
 from fastapi import FastAPI, Header, HTTPException, Request
-from typing import Optional
+from typing import Dict, Optional
 import jwt
 from pythonjsonlogger import jsonlogger
 import logging
@@ -28,18 +29,24 @@ def setup_json_logging() -> None:
         root.addHandler(handler)
 
 
-def get_role_for_key(api_key: str | None) -> str | None:
-    if not api_key:
-        return None
-    mapping = os.getenv("BOLCD_API_KEYS", "")
+@functools.lru_cache(maxsize=8)
+def _parse_key_mapping(mapping: str) -> Dict[str, str]:
+    """key -> role for a BOLCD_API_KEYS value; cached on the raw string so env changes still apply."""
+    roles: Dict[str, str] = {}
     for item in mapping.split(","):
         item = item.strip()
         if not item or ":" not in item:
             continue
         k, r = item.split(":", 1)
-        if api_key == k and r in ROLES:
-            return r
-    return None
+        if r in ROLES:
+            roles.setdefault(k, r)
+    return roles
+
+
+def get_role_for_key(api_key: str | None) -> str | None:
+    if not api_key:
+        return None
+    return _parse_key_mapping(os.getenv("BOLCD_API_KEYS", "")).get(api_key)
 
 
 def _fetch_jwks() -> dict:
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
+import os
 from dataclasses import dataclass, asdict
 from datetime import UTC, datetime
 from pathlib import Path
@@ -71,24 +73,28 @@ class JSONLAuditStore:
     def tail(self, limit: int = 100) -> List[Dict[str, Any]]:
         if limit <= 0:
             return []
-        # Simple tail without loading whole file for typical small CI/demo sizes
-        lines: List[str] = []
+        # Scan backwards over a read-only mapping: only the pages holding the
+        # last `limit` lines are touched, however large the log has grown
+        lines: List[bytes] = []
         try:
-            with self.path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    lines.append(line)
-                    if len(lines) > limit:
-                        lines.pop(0)
+            with self.path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return []
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    while end > 0 and len(lines) < limit:
+                        start = mm.rfind(b"\n", 0, end) + 1
+                        line = mm[start:end].strip()
+                        if line:
+                            lines.append(line)
+                        end = start - 1
         except FileNotFoundError:
             return []
         out: List[Dict[str, Any]] = []
-        for line in lines[-limit:]:
-            line = line.strip()
-            if not line:
-                continue
+        for line in reversed(lines):
             try:
                 out.append(json.loads(line))
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
         return out
 
@@ -8,8 +8,12 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List
 
+from bolcd.core.binarization import NUMPY_AVAILABLE
 from bolcd.core.pipeline import generate_synthetic_events, learn_graph_from_events
 
+if NUMPY_AVAILABLE:
+    from bolcd.core.pipeline import generate_synthetic_columns
+
 
 @dataclass
 class BenchParams:
@@ -24,7 +28,10 @@ class BenchParams:
 def run_once(params: BenchParams) -> Dict[str, Any]:
     metrics = [f"m{i}" for i in range(params.d)]
     thresholds = {m: 0.5 for m in metrics}
-    events = generate_synthetic_events(metrics, n=params.n)
+    if NUMPY_AVAILABLE:
+        events = generate_synthetic_columns(metrics, n=params.n)
+    else:
+        events = generate_synthetic_events(metrics, n=params.n)
     t0 = time.perf_counter()
     g = learn_graph_from_events(events, thresholds, params.delta, params.fdr_q, params.epsilon)
     t1 = time.perf_counter()
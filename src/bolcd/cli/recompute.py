@@ -8,7 +8,7 @@ from typing import Dict, List
 import yaml
 
 from bolcd.core.pipeline import learn_graphs_by_segments
-from bolcd.ui.graph_export import to_graphml
+from bolcd.ui.graph_export import stream_graphml
 from bolcd.io.jsonl import read_jsonl
 
 
@@ -62,7 +62,8 @@ def main(argv: List[str] | None = None) -> int:
         json.dump(graphs["union"], f, ensure_ascii=False, indent=2)
 
     if args.out_graphml:
-        args.out_graphml.write_text(to_graphml(graphs["union"]), encoding="utf-8")
+        with args.out_graphml.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            stream_graphml(graphs["union"], f)
 
     print(
         f"Wrote {args.out_json} with {len(graphs['union']['nodes'])} nodes and {len(graphs['union']['edges'])} edges"
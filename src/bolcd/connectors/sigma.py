@@ -33,7 +33,10 @@ def parse_sigma_to_events(rule: Dict[str, Any]) -> SigmaRule:
 
 
 def load_sigma_yaml(path: str) -> Dict[str, Any]:
-    data = yaml.safe_load(open(path, "r", encoding="utf-8"))
+    # libyaml's C loader when PyYAML was built with it
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=loader)
     if not isinstance(data, dict):
         raise ValueError("Sigma YAML must be a mapping")
     return data
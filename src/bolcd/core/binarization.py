@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 
 def binarize_events(
-    events: Iterable[Dict[str, float]],
+    events: Iterable[Dict[str, float]] | Mapping[str, Sequence[float]],
     thresholds: Dict[str, float],
     margin_delta: float,
 ) -> Tuple[List[int], List[int]]:
@@ -18,14 +24,83 @@ def binarize_events(
 
     Returns tuple (values_bitset_per_metric, unknown_mask_per_metric), each list of bitsets
     packed into Python ints with bit k representing event index k.
+
+    ``events`` may also be columnar, ``{metric: values}`` with one equal-length
+    sequence per metric, which skips the per-event dict lookups under NumPy.
     """
     metrics = list(thresholds.keys())
-    n = 0
-    events_list = []
-    for ev in events:
-        events_list.append(ev)
-        n += 1
+    if isinstance(events, Mapping):
+        if NUMPY_AVAILABLE and metrics:
+            ones, unknown = binarize_columns(events, metrics, thresholds, margin_delta)
+            return pack_columns(ones), pack_columns(unknown)
+        events = [dict(zip(events, row)) for row in zip(*events.values())]
+    events_list = list(events)
+    if NUMPY_AVAILABLE and events_list and metrics:
+        return _binarize_numpy(events_list, metrics, thresholds, margin_delta)
+    return _binarize_python(events_list, metrics, thresholds, margin_delta)
+
+
+def _binarize_numpy(
+    events_list: Sequence[Dict[str, float]],
+    metrics: Sequence[str],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+) -> Tuple[List[int], List[int]]:
+    ones, unknown = binarize_matrix(events_list, metrics, thresholds, margin_delta)
+    return pack_columns(ones), pack_columns(unknown)
 
+
+def binarize_matrix(
+    events_list: Sequence[Dict[str, float]],
+    metrics: Sequence[str],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(n_events, n_metrics) bool masks for 1 and unknown; requires NumPy."""
+    # Missing metrics become NaN, which compares False both ways
+    arr = np.array([list(map(ev.get, metrics)) for ev in events_list], dtype=np.float64)
+    return _threshold(arr, metrics, thresholds, margin_delta)
+
+
+def binarize_columns(
+    columns: Mapping[str, Sequence[float]],
+    metrics: Sequence[str],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Like :func:`binarize_matrix` for ``{metric: 1-D values}``; absent metrics are unknown."""
+    n = len(next(iter(columns.values()), ()))
+    arr = np.full((n, len(metrics)), np.nan)
+    for j, m in enumerate(metrics):
+        if m in columns:
+            arr[:, j] = columns[m]
+    return _threshold(arr, metrics, thresholds, margin_delta)
+
+
+def _threshold(
+    arr: np.ndarray,
+    metrics: Sequence[str],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    a = np.array([thresholds[m] for m in metrics], dtype=np.float64)
+    ones = arr >= a + margin_delta
+    unknown = ~ones & ~(arr <= a - margin_delta)
+    return ones, unknown
+
+
+def pack_columns(mask: np.ndarray) -> List[int]:
+    """Pack each column of a (n_events, n_metrics) bool mask into an int, bit k = row k."""
+    packed = np.packbits(mask, axis=0, bitorder="little")
+    return [int.from_bytes(packed[:, j].tobytes(), "little") for j in range(mask.shape[1])]
+
+
+def _binarize_python(
+    events_list: Sequence[Dict[str, float]],
+    metrics: Sequence[str],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+) -> Tuple[List[int], List[int]]:
     values: List[int] = [0] * len(metrics)
     unknowns: List[int] = [0] * len(metrics)
 
@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from typing import Iterable, List, Tuple
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 def bh_qvalues(p_values: Iterable[float]) -> List[float]:
     """
@@ -17,6 +23,8 @@ def bh_qvalues(p_values: Iterable[float]) -> List[float]:
     m = len(ps)
     if m == 0:
         return []
+    if NUMPY_AVAILABLE:
+        return _bh_qvalues_numpy(ps)
 
     indexed = sorted(enumerate(ps), key=lambda t: t[1])  # (orig_idx, p)
     # Step 2: raw q-values by rank
@@ -39,3 +47,15 @@ def bh_qvalues(p_values: Iterable[float]) -> List[float]:
     for (orig_idx, _p), q in zip(indexed, q_ranked):
         out[orig_idx] = min(1.0, q)
     return out
+
+
+def _bh_qvalues_numpy(ps: List[float]) -> List[float]:
+    """Same steps as bh_qvalues, as argsort + reverse minimum.accumulate."""
+    p = np.asarray(ps, dtype=np.float64)
+    m = p.size
+    order = np.argsort(p, kind="stable")  # stable, like sorted()
+    q_ranked = (p[order] * m) / np.arange(1, m + 1)
+    q_ranked = np.minimum.accumulate(q_ranked[::-1])[::-1]
+    out = np.empty(m, dtype=np.float64)
+    out[order] = np.minimum(q_ranked, 1.0)
+    return out.tolist()
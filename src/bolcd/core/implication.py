@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+    # np.bitwise_count (a vectorized popcount) arrived in NumPy 2.0
+    NUMPY_AVAILABLE = hasattr(np, "bitwise_count")
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 
 @dataclass
@@ -68,6 +75,44 @@ def one_sided_binomial_pvalue(k: int, n: int, p0: float) -> float:
     return max(0.0, min(1.0, cdf))
 
 
+def _pair_counts(
+    values_per_metric: Sequence[int],
+    unknown_per_metric: Sequence[int],
+) -> Tuple[List[int], List[List[int]]]:
+    """
+    n_src1 per metric and the k matrix (k[i][j] for the pair i -> j).
+
+    S_i & ~S_j & ~unknown_j == S_i & ~(S_j | unknown_j), so each destination's
+    mask is built once and every pair is one AND plus a popcount.
+    """
+    if NUMPY_AVAILABLE:
+        return _pair_counts_numpy(values_per_metric, unknown_per_metric)
+    n_src = [popcount(v & ~u) for v, u in zip(values_per_metric, unknown_per_metric)]
+    dst_masks = [~(v | u) for v, u in zip(values_per_metric, unknown_per_metric)]
+    k = [[popcount(v & m) for m in dst_masks] for v in values_per_metric]
+    return n_src, k
+
+
+def _pair_counts_numpy(
+    values_per_metric: Sequence[int],
+    unknown_per_metric: Sequence[int],
+) -> Tuple[List[int], List[List[int]]]:
+    # Unpack the int bitsets into (d, words) uint64 rows, bit k = event k as before
+    nbits = max([x.bit_length() for x in (*values_per_metric, *unknown_per_metric)], default=0)
+    nbytes = max(1, (nbits + 63) // 64) * 8
+
+    def rows(bitsets: Sequence[int]) -> np.ndarray:
+        buf = b"".join(x.to_bytes(nbytes, "little") for x in bitsets)
+        return np.frombuffer(buf, dtype="<u8").reshape(len(bitsets), -1)
+
+    vals = rows(values_per_metric)
+    unks = rows(unknown_per_metric)
+    n_src = np.bitwise_count(vals & ~unks).sum(axis=1)
+    dst_masks = ~(vals | unks)
+    k = np.stack([np.bitwise_count(v & dst_masks).sum(axis=1) for v in vals])
+    return n_src.tolist(), k.tolist()
+
+
 def compute_all_edges(
     metric_names: Sequence[str],
     values_per_metric: Sequence[int],
@@ -83,18 +128,17 @@ def compute_all_edges(
     """
     d = len(metric_names)
     edges: List[EdgeStats] = []
-    not_unknown_src = [~u for u in unknown_per_metric]
+    if d == 0:
+        return edges
+    n_src, k_matrix = _pair_counts(values_per_metric, unknown_per_metric)
     for i in range(d):
-        src_bits = values_per_metric[i]
-        src_n = popcount(src_bits & not_unknown_src[i])
+        src_n = n_src[i]
         if src_n == 0:
             continue
         for j in range(d):
             if i == j:
                 continue
-            dst_bits = values_per_metric[j]
-            dst_unk = unknown_per_metric[j]
-            k = compute_counterexamples(src_bits, dst_bits, dst_unk)
+            k = k_matrix[i][j]
             if k == 0:
                 ci = rule_of_three_upper(src_n)
                 edges.append(
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Any, Dict, Iterable, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
-from .binarization import binarize_events
+from .binarization import NUMPY_AVAILABLE, binarize_events
 from .fdr import bh_qvalues
 from .implication import EdgeStats, compute_all_edges
 from .transitive_reduction import transitive_reduction
 
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+    from .binarization import binarize_matrix, pack_columns
+
 
 @dataclass
 class GraphEdge:
@@ -20,7 +25,7 @@ class GraphEdge:
 
 
 def learn_graph_from_events(
-    events: Iterable[Dict[str, float]],
+    events: Iterable[Dict[str, float]] | Mapping[str, Sequence[float]],
     thresholds: Dict[str, float],
     margin_delta: float,
     fdr_q: float,
@@ -28,7 +33,16 @@ def learn_graph_from_events(
 ) -> Dict[str, Any]:
     metric_names: List[str] = list(thresholds.keys())
     values, unknowns = binarize_events(events, thresholds, margin_delta)
+    return _learn_graph_from_bitsets(metric_names, values, unknowns, fdr_q, epsilon)
+
 
+def _learn_graph_from_bitsets(
+    metric_names: List[str],
+    values: List[int],
+    unknowns: List[int],
+    fdr_q: float,
+    epsilon: float,
+) -> Dict[str, Any]:
     # Compute pairwise stats
     raw_edges: List[EdgeStats] = compute_all_edges(metric_names, values, unknowns, epsilon)
 
@@ -88,18 +102,11 @@ def generate_synthetic_events(metric_names: Sequence[str], n: int = 1200) -> Lis
     Generate synthetic events inducing a DAG X->Y->Z with zero counterexamples for
     X->Y and Y->Z (and thus X->Z), while ensuring reverse directions have counterexamples.
     """
-    if len(metric_names) < 3:
-        metric_names = list(metric_names) + [f"m{i}" for i in range(3 - len(metric_names))]
-    m0, m1, m2 = metric_names[:3]
+    m0, m1, m2 = _synthetic_chain(metric_names)
+    n1, n2, n3, n4 = _synthetic_blocks(n)
 
     events: List[Dict[str, float]] = []
 
-    n1 = n // 2   # X=1,Y=1,Z=1
-    n2 = n // 3   # X=0,Y=1,Z=1 (break Y->X)
-    n3 = n // 6   # X=0,Y=0,Z=1 (break Z->Y and Z->X)
-    total = n1 + n2 + n3
-    n4 = max(0, n - total)  # X=0,Y=0,Z=0
-
     for _ in range(n1):
         events.append({m0: 1.0, m1: 1.0, m2: 1.0})
     for _ in range(n2):
@@ -112,6 +119,34 @@ def generate_synthetic_events(metric_names: Sequence[str], n: int = 1200) -> Lis
     return events
 
 
+def generate_synthetic_columns(metric_names: Sequence[str], n: int = 1200) -> Dict[str, np.ndarray]:
+    """Columnar form of :func:`generate_synthetic_events` (same rows, same order); requires NumPy."""
+    m0, m1, m2 = _synthetic_chain(metric_names)
+    n1, n2, n3, _ = _synthetic_blocks(n)
+    idx = np.arange(n)
+    return {
+        m0: (idx < n1).astype(np.float64),
+        m1: (idx < n1 + n2).astype(np.float64),
+        m2: (idx < n1 + n2 + n3).astype(np.float64),
+    }
+
+
+def _synthetic_chain(metric_names: Sequence[str]) -> Tuple[str, str, str]:
+    if len(metric_names) < 3:
+        metric_names = list(metric_names) + [f"m{i}" for i in range(3 - len(metric_names))]
+    m0, m1, m2 = metric_names[:3]
+    return m0, m1, m2
+
+
+def _synthetic_blocks(n: int) -> Tuple[int, int, int, int]:
+    n1 = n // 2   # X=1,Y=1,Z=1
+    n2 = n // 3   # X=0,Y=1,Z=1 (break Y->X)
+    n3 = n // 6   # X=0,Y=0,Z=1 (break Z->Y and Z->X)
+    total = n1 + n2 + n3
+    n4 = max(0, n - total)  # X=0,Y=0,Z=0
+    return n1, n2, n3, n4
+
+
 def group_events_by_segments(
     events: Iterable[Dict[str, Any]], segment_keys: Sequence[str] | None
 ) -> Dict[Tuple[Any, ...], List[Dict[str, Any]]]:
@@ -125,6 +160,39 @@ def group_events_by_segments(
     return out
 
 
+def _segment_graphs(
+    events: Iterable[Dict[str, Any]],
+    thresholds: Dict[str, float],
+    margin_delta: float,
+    fdr_q: float,
+    epsilon: float,
+    segment_by: Sequence[str] | None,
+) -> Iterator[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+    """Yield (segment tuple, graph) in first-seen segment order."""
+    metric_names: List[str] = list(thresholds.keys())
+    events_list = list(events)
+    if not (NUMPY_AVAILABLE and segment_by and events_list and metric_names):
+        for seg_tuple, seg_events in group_events_by_segments(events_list, segment_by).items():
+            yield seg_tuple, learn_graph_from_events(seg_events, thresholds, margin_delta, fdr_q, epsilon)
+        return
+
+    # Binarize every event once, then slice rows per segment instead of
+    # regrouping the dicts and binarizing each bucket separately
+    ones, unknown = binarize_matrix(events_list, metric_names, thresholds, margin_delta)
+    seg_ids: Dict[Tuple[Any, ...], int] = {}
+    inverse = np.fromiter(
+        (seg_ids.setdefault(tuple(ev.get(k) for k in segment_by), len(seg_ids)) for ev in events_list),
+        dtype=np.intp,
+        count=len(events_list),
+    )
+    # Row indices grouped by segment id in one pass; the stable sort keeps event order
+    order = np.argsort(inverse, kind="stable")
+    groups = np.split(order, np.cumsum(np.bincount(inverse, minlength=len(seg_ids)))[:-1])
+    for seg_tuple, rows in zip(seg_ids, groups):
+        values, unknowns = pack_columns(ones[rows]), pack_columns(unknown[rows])
+        yield seg_tuple, _learn_graph_from_bitsets(metric_names, values, unknowns, fdr_q, epsilon)
+
+
 def learn_graphs_by_segments(
     events: Iterable[Dict[str, Any]],
     thresholds: Dict[str, float],
@@ -134,14 +202,12 @@ def learn_graphs_by_segments(
     segment_by: Sequence[str] | None,
 ) -> Dict[str, Any]:
     """Return a dict with per-segment graphs and a flattened union for convenience."""
-    buckets = group_events_by_segments(events, segment_by)
     per_segment: Dict[str, Dict[str, Any]] = {}
     union_nodes: set[str] = set()
     union_edges: List[Dict[str, Any]] = []
     union_edges_pre: List[Dict[str, Any]] = []
 
-    for seg_tuple, seg_events in buckets.items():
-        graph = learn_graph_from_events(seg_events, thresholds, margin_delta, fdr_q, epsilon)
+    for seg_tuple, graph in _segment_graphs(events, thresholds, margin_delta, fdr_q, epsilon, segment_by):
         seg_key = ",".join(str(v) for v in seg_tuple) if seg_tuple else "__all__"
         # annotate edges with segment label (pre-TR and post-TR)
         for e in graph.get("edges", []):
@@ -22,10 +22,56 @@ def _bfs_reachable(adj: Dict[str, Set[str]], src: str, dst: str) -> bool:
     return False
 
 
+def _topological_order(adj: Dict[str, Set[str]]) -> List[str] | None:
+    """Kahn's algorithm; None if the graph has a cycle."""
+    indegree: Dict[str, int] = {u: 0 for u in adj}
+    for vs in adj.values():
+        for v in vs:
+            indegree[v] += 1
+    order: List[str] = []
+    ready = deque(u for u, d in indegree.items() if d == 0)
+    while ready:
+        u = ready.popleft()
+        order.append(u)
+        for v in adj[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                ready.append(v)
+    return order if len(order) == len(adj) else None
+
+
+def _reduce_dag(adj: Dict[str, Set[str]], order: List[str]) -> List[Tuple[str, str]]:
+    """
+    Reachability as int bitsets (bit i = node i), filled in reverse topological order.
+    (u,v) is implied iff v is reachable from some successor of u; in a DAG v can't
+    reach itself, so OR-ing the reach of every successor (v included) is enough.
+    """
+    index = {u: i for i, u in enumerate(adj)}
+    reach: Dict[str, int] = {}
+    for u in reversed(order):
+        r = 0
+        for v in adj[u]:
+            r |= (1 << index[v]) | reach[v]
+        reach[u] = r
+
+    reduced: List[Tuple[str, str]] = []
+    for u, vs in adj.items():
+        indirect = 0
+        for w in vs:
+            indirect |= reach[w]
+        for v in vs:
+            if not (indirect >> index[v]) & 1:
+                reduced.append((u, v))
+    return reduced
+
+
 def transitive_reduction(edges: Iterable[Tuple[str, str]]) -> List[Tuple[str, str]]:
     """
     Given a DAG edges list (src,dst), remove edges that are transitively implied.
     For each edge (u,v), temporarily remove it and if reachable(u,v) then drop it.
+
+    DAGs take a bitset reachability pass; graphs with cycles (e.g. mutually
+    implied metrics) keep the per-edge BFS, whose result depends on edge order.
     """
     # Build adjacency sets
     adj: Dict[str, Set[str]] = defaultdict(set)
@@ -33,6 +79,10 @@ def transitive_reduction(edges: Iterable[Tuple[str, str]]) -> List[Tuple[str, st
         adj[u].add(v)
         adj.setdefault(v, set())
 
+    order = _topological_order(adj)
+    if order is not None:
+        return _reduce_dag(adj, order)
+
     # Work on a copy since we remove edges
     result_adj: Dict[str, Set[str]] = {u: set(vs) for u, vs in adj.items()}
 
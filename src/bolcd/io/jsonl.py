@@ -4,9 +4,28 @@ import json
 from pathlib import Path
 from typing import Any, Dict, Iterator
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def read_jsonl(path: str | Path) -> Iterator[Dict[str, Any]]:
     p = Path(path)
+    if ORJSON_AVAILABLE:
+        # Bytes straight to orjson, which decodes UTF-8 itself; lines it rejects
+        # but json accepts (NaN/Infinity, ints beyond 64 bits) go through json
+        with p.open("rb") as f:
+            for raw in f:
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    yield orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    yield json.loads(raw)
+        return
     with p.open("r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
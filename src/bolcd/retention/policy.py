@@ -7,18 +7,40 @@ Supports different retention periods for different data types and compliance req
 from __future__ import annotations
 
 import os
+import re
+import errno
+import gzip
 import json
-from datetime import datetime, timedelta
+import functools
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 import logging
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Rows fetched per round trip when exporting records to the archive
+ARCHIVE_YIELD_PER = 10_000
+
+# Monthly child tables of a range-partitioned alerts table, e.g. alerts_2025_01
+_ALERTS_PARTITION_RE = re.compile(r"^alerts_(\d{4})_(\d{2})$")
+
+# Gzip of archived files runs here so the sweep is not blocked on compression
+_archive_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bolcd-archive")
+
 
 class RetentionPeriod(Enum):
     """Standard retention periods"""
@@ -33,6 +55,9 @@ class RetentionPeriod(Enum):
     UNLIMITED = -1  # No automatic deletion
 
 
+_DAYS_TO_PERIOD: Dict[int, RetentionPeriod] = {p.value: p for p in RetentionPeriod}
+
+
 class DataType(Enum):
     """Types of data with different retention requirements"""
     ALERTS = "alerts"
@@ -44,6 +69,81 @@ class DataType(Enum):
     COMPLIANCE = "compliance"
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_config_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a retention config file; the mtime in the key invalidates stale entries"""
+    if path.endswith(".yaml"):
+        import yaml
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path, "r") as f:
+            return yaml.load(f, Loader=loader) or {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _json_line(record: Dict[str, Any]) -> bytes:
+    """Serialize one archived record as a JSONL line, byte-identical with or without orjson"""
+    if ORJSON_AVAILABLE:
+        # Datetimes go through default=str like the json path ("2025-01-01 00:00:00")
+        return orjson.dumps(
+            record, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_APPEND_NEWLINE
+        )
+    return (json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _fast_move(src: Path, dst: Path) -> None:
+    """Move a file, falling back to a copy when src and dst are on different filesystems
+
+    shutil.copy2 uses os.sendfile on Linux, so the fallback copy stays in the
+    kernel, and it preserves the mtime used to date archived files.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(src, dst)
+        os.unlink(src)
+
+
+def _compress_file(path: Path) -> None:
+    """Gzip a file next to itself and remove the original"""
+    with open(path, "rb") as f_in, gzip.open(f"{path}.gz", "wb", compresslevel=1) as f_out:
+        shutil.copyfileobj(f_in, f_out, 1 << 20)
+    path.unlink()
+
+
+def _expired_files(directory: Path, cutoff_ts: float, suffix: str = "") -> List[Path]:
+    """List regular files in a directory whose mtime is older than cutoff_ts
+
+    Uses os.scandir so the stat result is cached on each DirEntry. The list is
+    materialized up front because callers move or delete the returned files.
+    """
+    expired: List[Path] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file() and entry.stat().st_mtime < cutoff_ts:
+                    expired.append(Path(entry.path))
+    except FileNotFoundError:
+        pass
+    return expired
+
+
+def _tree_size(directory: Path) -> int:
+    """Total size in bytes of the regular files below a directory"""
+    total = 0
+    stack = [os.fspath(directory)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    total += entry.stat().st_size
+    return total
+
+
 class RetentionPolicy:
     """Data retention policy configuration"""
     
@@ -86,17 +186,46 @@ class RetentionManager:
         self.storage_path = Path(storage_path or os.getenv("BOLCD_STORAGE_PATH", "./data"))
         self.archive_path = self.storage_path / "archive"
         self.archive_path.mkdir(parents=True, exist_ok=True)
+        self.delete_batch_size = int(os.getenv("BOLCD_DELETE_BATCH_SIZE", "10000"))
+        self._pending_archives: List[Future] = []
+        self._alerts_index_checked = False
+        # Storage usage per directory: (size_bytes, dir_mtime_ns, computed_at)
+        self._size_cache: Dict[str, Tuple[int, int, float]] = {}
+        self.status_cache_ttl = float(os.getenv("BOLCD_RETENTION_STATUS_TTL", "60"))
+        self.alerts_partitioned = os.getenv("BOLCD_ALERTS_PARTITIONED", "0").strip() in {"1", "true", "True"}
         
         # Default policies
         self.policies: Dict[DataType, RetentionPolicy] = self._load_default_policies()
         
         # Load custom policies from config
         self._load_config()
-        
-        # Initialize database connection if needed
-        if self.database_url:
-            self.engine = create_engine(self.database_url)
-            self.SessionLocal = sessionmaker(bind=self.engine)
+    
+    @functools.cached_property
+    def engine(self):
+        """Database engine, created on first use so filesystem-only sweeps never connect"""
+        if self.database_url.startswith("sqlite"):
+            engine = create_engine(self.database_url)
+            
+            @event.listens_for(engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                # WAL + NORMAL avoids an fsync per committed DELETE batch
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+            
+            return engine
+        # Retention is a single short burst: a small pool without pre-ping is enough
+        return create_engine(
+            self.database_url,
+            pool_size=2,
+            max_overflow=0,
+            isolation_level="READ COMMITTED"
+        )
+    
+    @functools.cached_property
+    def SessionLocal(self):
+        return sessionmaker(bind=self.engine)
     
     def _load_default_policies(self) -> Dict[DataType, RetentionPolicy]:
         """Load default retention policies"""
@@ -142,13 +271,7 @@ class RetentionManager:
             return
         
         try:
-            if config_path.suffix == ".yaml":
-                import yaml
-                with open(config_path, "r") as f:
-                    config = yaml.safe_load(f)
-            else:
-                with open(config_path, "r") as f:
-                    config = json.load(f)
+            config = _parse_config_cached(str(config_path), config_path.stat().st_mtime_ns)
             
             # Override default policies with custom config
             for data_type_str, policy_config in config.get("retention_policies", {}).items():
@@ -156,12 +279,8 @@ class RetentionManager:
                     data_type = DataType(data_type_str)
                     retention_days = policy_config.get("retention_days", 90)
                     
-                    # Find matching retention period enum
-                    retention_period = RetentionPeriod.DAYS_90  # default
-                    for period in RetentionPeriod:
-                        if period.value == retention_days:
-                            retention_period = period
-                            break
+                    # Find matching retention period enum (default 90 days)
+                    retention_period = _DAYS_TO_PERIOD.get(retention_days, RetentionPeriod.DAYS_90)
                     
                     self.policies[data_type] = RetentionPolicy(
                         data_type=data_type,
@@ -178,14 +297,25 @@ class RetentionManager:
     
     def apply_retention_policies(self, dry_run: bool = False) -> Dict[str, Any]:
         """Apply retention policies to delete old data"""
+        now = datetime.now(timezone.utc)
         results = {
-            "timestamp": datetime.now(datetime.UTC).isoformat(),
+            "timestamp": now.isoformat(),
             "dry_run": dry_run,
             "deleted": {},
             "archived": {},
             "errors": []
         }
         
+        cleaners = {
+            DataType.ALERTS: self._clean_alerts,
+            DataType.AUDIT_LOGS: self._clean_audit_logs,
+            DataType.METRICS: self._clean_metrics,
+            DataType.REPORTS: self._clean_reports,
+        }
+        
+        # Data types touch disjoint directories/tables and each cleaner opens its
+        # own DB session, so they can run concurrently
+        tasks = []
         for data_type, policy in self.policies.items():
             if not policy.enabled or policy.compliance_hold:
                 continue
@@ -193,30 +323,21 @@ class RetentionManager:
             if policy.retention_period == RetentionPeriod.UNLIMITED:
                 continue
             
+            cutoff_date = now - timedelta(days=policy.retention_period.value)
+            if data_type == DataType.TEMPORARY:
+                tasks.append((data_type, self._clean_temporary_files, (cutoff_date, dry_run)))
+            elif data_type in cleaners:
+                tasks.append((data_type, cleaners[data_type], (cutoff_date, dry_run, policy.archive_before_delete)))
+        
+        futures = []
+        if tasks:
+            with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="bolcd-retention") as pool:
+                futures = [(data_type, pool.submit(cleaner, *args)) for data_type, cleaner, args in tasks]
+        
+        # Collect in policy order so the results are deterministic
+        for data_type, future in futures:
             try:
-                cutoff_date = datetime.now(datetime.UTC) - timedelta(days=policy.retention_period.value)
-                
-                # Process based on data type
-                if data_type == DataType.ALERTS:
-                    count = self._clean_alerts(cutoff_date, dry_run, policy.archive_before_delete)
-                    results["deleted"][data_type.value] = count
-                    
-                elif data_type == DataType.AUDIT_LOGS:
-                    count = self._clean_audit_logs(cutoff_date, dry_run, policy.archive_before_delete)
-                    results["deleted"][data_type.value] = count
-                    
-                elif data_type == DataType.METRICS:
-                    count = self._clean_metrics(cutoff_date, dry_run, policy.archive_before_delete)
-                    results["deleted"][data_type.value] = count
-                    
-                elif data_type == DataType.REPORTS:
-                    count = self._clean_reports(cutoff_date, dry_run, policy.archive_before_delete)
-                    results["deleted"][data_type.value] = count
-                    
-                elif data_type == DataType.TEMPORARY:
-                    count = self._clean_temporary_files(cutoff_date, dry_run)
-                    results["deleted"][data_type.value] = count
-                    
+                results["deleted"][data_type.value] = future.result()
             except Exception as e:
                 logger.error(f"Error applying retention for {data_type.value}: {e}")
                 results["errors"].append({
@@ -224,116 +345,210 @@ class RetentionManager:
                     "error": str(e)
                 })
         
+        # Wait for background compression of archived files
+        pending, self._pending_archives = self._pending_archives, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error compressing archived file: {e}")
+                results["errors"].append({
+                    "data_type": "archive",
+                    "error": str(e)
+                })
+        
         return results
     
     def _clean_alerts(self, cutoff_date: datetime, dry_run: bool, archive: bool) -> int:
         """Clean old alert data"""
         count = 0
+        cutoff_ts = cutoff_date.timestamp()
         
         # Clean from database
-        if self.database_url:
+        if self.database_url and self.alerts_partitioned:
+            count = self._clean_alerts_partitioned(cutoff_date, dry_run, archive)
+        elif self.database_url:
+            self._ensure_alerts_index()
             with self.SessionLocal() as session:
-                # Count records to delete
-                result = session.execute(
-                    text("SELECT COUNT(*) FROM alerts WHERE created_at < :cutoff"),
-                    {"cutoff": cutoff_date}
-                )
-                count = result.scalar() or 0
-                
-                if not dry_run and count > 0:
+                if dry_run:
+                    # Count records that would be deleted
+                    result = session.execute(
+                        text("SELECT COUNT(*) FROM alerts WHERE ts < :cutoff"),
+                        {"cutoff": cutoff_date}
+                    )
+                    count = result.scalar() or 0
+                else:
                     if archive:
                         # Archive before deletion
-                        self._archive_database_records("alerts", cutoff_date)
+                        exists = session.execute(
+                            text("SELECT 1 FROM alerts WHERE ts < :cutoff LIMIT 1"),
+                            {"cutoff": cutoff_date}
+                        ).first()
+                        if exists is not None:
+                            self._archive_database_records("alerts", cutoff_date)
                     
-                    # Delete old records
-                    session.execute(
-                        text("DELETE FROM alerts WHERE created_at < :cutoff"),
-                        {"cutoff": cutoff_date}
-                    )
-                    session.commit()
+                    # Delete old records in bounded batches, one transaction each,
+                    # so locks and WAL growth stay small on large tables
+                    batch_size = self.delete_batch_size
+                    while True:
+                        result = session.execute(
+                            text(
+                                "DELETE FROM alerts WHERE id IN ("
+                                "SELECT id FROM alerts WHERE ts < :cutoff "
+                                "ORDER BY id LIMIT :batch)"
+                            ),
+                            {"cutoff": cutoff_date, "batch": batch_size}
+                        )
+                        session.commit()
+                        deleted = max(result.rowcount or 0, 0)
+                        count += deleted
+                        if deleted < batch_size:
+                            break
         
         # Clean from filesystem
         alerts_path = self.storage_path / "alerts"
-        if alerts_path.exists():
-            for file_path in alerts_path.glob("*.jsonl"):
-                # Check file modification time
-                if datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_date:
-                    count += 1
-                    if not dry_run:
-                        if archive:
-                            self._archive_file(file_path)
-                        file_path.unlink()
+        for file_path in _expired_files(alerts_path, cutoff_ts, ".jsonl"):
+            count += 1
+            if not dry_run:
+                if archive:
+                    self._archive_file(file_path)
+                else:
+                    file_path.unlink()
         
         return count
     
+    def _clean_alerts_partitioned(self, cutoff_date: datetime, dry_run: bool, archive: bool) -> int:
+        """Drop monthly alert partitions that end before the cutoff (PostgreSQL)
+        
+        Enabled with BOLCD_ALERTS_PARTITIONED=1. Expects alerts to be range
+        partitioned by ts into monthly children named alerts_YYYY_MM:
+        
+            CREATE TABLE alerts (...) PARTITION BY RANGE (ts);
+            CREATE TABLE alerts_2025_01 PARTITION OF alerts
+                FOR VALUES FROM ('2025-01-01') TO ('2025-02-01');
+        
+        Detaching and dropping a partition is a metadata operation instead of a
+        row-by-row DELETE. Partitions straddling the cutoff are kept until the
+        next sweep after they fully expire. The returned count uses the planner's
+        row estimate (pg_class.reltuples) so no partition is scanned.
+        """
+        count = 0
+        with self.SessionLocal() as session:
+            partitions = session.execute(text(
+                "SELECT c.relname, c.reltuples FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'alerts'"
+            )).all()
+            
+            for name, reltuples in sorted(partitions):
+                match = _ALERTS_PARTITION_RE.match(name)
+                if not match:
+                    continue
+                year, month = int(match.group(1)), int(match.group(2))
+                # Partition covers [YYYY-MM-01, first day of the next month)
+                upper = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=cutoff_date.tzinfo)
+                if upper > cutoff_date:
+                    continue
+                
+                count += max(int(reltuples or 0), 0)
+                if dry_run:
+                    continue
+                if archive:
+                    self._archive_database_records(name, upper)
+                session.execute(text(f'ALTER TABLE alerts DETACH PARTITION "{name}"'))
+                session.execute(text(f'DROP TABLE "{name}"'))
+                session.commit()
+                logger.info(f"Dropped expired alerts partition {name}")
+        
+        return count
+    
+    def _ensure_alerts_index(self):
+        """Create the ts index the retention deletes rely on, once per manager"""
+        if self._alerts_index_checked:
+            return
+        self._alerts_index_checked = True
+        
+        if self.engine.dialect.name == "postgresql":
+            # BRIN suits the append-only, roughly monotonic ts column
+            ddl = "CREATE INDEX IF NOT EXISTS idx_alerts_ts_brin ON alerts USING BRIN (ts)"
+        else:
+            # Same name as the model's index=True, so this is a no-op on create_all schemas
+            ddl = "CREATE INDEX IF NOT EXISTS ix_alerts_ts ON alerts (ts)"
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(ddl))
+        except Exception as e:
+            # Table may not exist yet, or the dialect lacks IF NOT EXISTS
+            logger.warning(f"Could not ensure alerts ts index: {e}")
+    
     def _clean_audit_logs(self, cutoff_date: datetime, dry_run: bool, archive: bool) -> int:
         """Clean old audit logs"""
         count = 0
+        cutoff_ts = cutoff_date.timestamp()
         
         # Clean audit log files
         audit_path = self.storage_path / "audit"
-        if audit_path.exists():
-            for file_path in audit_path.glob("*.jsonl"):
-                if datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_date:
-                    count += 1
-                    if not dry_run:
-                        if archive:
-                            self._archive_file(file_path)
-                        file_path.unlink()
+        for file_path in _expired_files(audit_path, cutoff_ts, ".jsonl"):
+            count += 1
+            if not dry_run:
+                if archive:
+                    self._archive_file(file_path)
+                else:
+                    file_path.unlink()
         
         return count
     
     def _clean_metrics(self, cutoff_date: datetime, dry_run: bool, archive: bool) -> int:
         """Clean old metrics data"""
         count = 0
+        cutoff_ts = cutoff_date.timestamp()
         
         # Clean metrics files
         metrics_path = self.storage_path / "metrics"
-        if metrics_path.exists():
-            for file_path in metrics_path.glob("*.json"):
-                if datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_date:
-                    count += 1
-                    if not dry_run:
-                        if archive:
-                            self._archive_file(file_path)
-                        file_path.unlink()
+        for file_path in _expired_files(metrics_path, cutoff_ts, ".json"):
+            count += 1
+            if not dry_run:
+                if archive:
+                    self._archive_file(file_path)
+                else:
+                    file_path.unlink()
         
         return count
     
     def _clean_reports(self, cutoff_date: datetime, dry_run: bool, archive: bool) -> int:
         """Clean old reports"""
         count = 0
+        cutoff_ts = cutoff_date.timestamp()
         
         # Clean report files
         reports_path = self.storage_path / "reports"
-        if reports_path.exists():
-            for file_path in reports_path.glob("*"):
-                if file_path.is_file() and datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_date:
-                    count += 1
-                    if not dry_run:
-                        if archive:
-                            self._archive_file(file_path)
-                        file_path.unlink()
+        for file_path in _expired_files(reports_path, cutoff_ts):
+            count += 1
+            if not dry_run:
+                if archive:
+                    self._archive_file(file_path)
+                else:
+                    file_path.unlink()
         
         return count
     
     def _clean_temporary_files(self, cutoff_date: datetime, dry_run: bool) -> int:
         """Clean temporary files"""
         count = 0
+        cutoff_ts = cutoff_date.timestamp()
         
         # Clean tmp directory
         tmp_path = self.storage_path / "tmp"
-        if tmp_path.exists():
-            for file_path in tmp_path.glob("*"):
-                if file_path.is_file() and datetime.fromtimestamp(file_path.stat().st_mtime) < cutoff_date:
-                    count += 1
-                    if not dry_run:
-                        file_path.unlink()
+        for file_path in _expired_files(tmp_path, cutoff_ts):
+            count += 1
+            if not dry_run:
+                file_path.unlink()
         
         return count
     
     def _archive_file(self, file_path: Path):
-        """Archive a file before deletion"""
+        """Move a file into the archive; large files are gzipped in the background"""
         # Create archive subdirectory based on date
         archive_date = datetime.fromtimestamp(file_path.stat().st_mtime)
         archive_subdir = self.archive_path / archive_date.strftime("%Y/%m")
@@ -341,32 +556,29 @@ class RetentionManager:
         
         # Move file to archive
         archive_file = archive_subdir / file_path.name
-        file_path.rename(archive_file)
+        _fast_move(file_path, archive_file)
         
         # Compress if large
         if archive_file.stat().st_size > 1024 * 1024:  # > 1MB
-            import gzip
-            with open(archive_file, "rb") as f_in:
-                with gzip.open(f"{archive_file}.gz", "wb") as f_out:
-                    f_out.writelines(f_in)
-            archive_file.unlink()
+            self._pending_archives.append(_archive_pool.submit(_compress_file, archive_file))
     
     def _archive_database_records(self, table: str, cutoff_date: datetime):
-        """Archive database records before deletion"""
+        """Archive alert rows (or an alerts partition) older than the cutoff before deletion"""
         with self.SessionLocal() as session:
-            # Export to JSON
+            # Export to JSON, streaming rows so memory stays flat for large tables
             result = session.execute(
-                text(f"SELECT * FROM {table} WHERE created_at < :cutoff"),
-                {"cutoff": cutoff_date}
+                text(f"SELECT * FROM {table} WHERE ts < :cutoff"),
+                {"cutoff": cutoff_date},
+                execution_options={"yield_per": ARCHIVE_YIELD_PER}
             )
             
-            # Save to archive
+            # Save to archive, compressing as we go
             archive_date = cutoff_date.strftime("%Y%m%d")
-            archive_file = self.archive_path / f"{table}_{archive_date}.jsonl"
+            archive_file = self.archive_path / f"{table}_{archive_date}.jsonl.gz"
             
-            with open(archive_file, "w") as f:
+            with gzip.open(archive_file, "wb", compresslevel=1) as f:
                 for row in result:
-                    f.write(json.dumps(dict(row), default=str) + "\n")
+                    f.write(_json_line(dict(row._mapping)))
     
     def get_retention_status(self) -> Dict[str, Any]:
         """Get current retention policy status"""
@@ -384,7 +596,7 @@ class RetentionManager:
         for data_type in DataType:
             path = self.storage_path / data_type.value
             if path.exists():
-                total_size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+                total_size = self._storage_usage(path)
                 status["storage_usage"][data_type.value] = {
                     "size_bytes": total_size,
                     "size_mb": round(total_size / (1024 * 1024), 2)
@@ -392,6 +604,24 @@ class RetentionManager:
         
         return status
     
+    def _storage_usage(self, path: Path) -> int:
+        """Size of a data directory, reusing the last scan while it is still valid
+        
+        A cached size is reused while the directory mtime is unchanged (files
+        added or removed) and it is younger than status_cache_ttl, which bounds
+        staleness from files that grow in place or change in subdirectories.
+        """
+        key = os.fspath(path)
+        dir_mtime_ns = os.stat(key).st_mtime_ns
+        now = time.monotonic()
+        cached = self._size_cache.get(key)
+        if cached and cached[1] == dir_mtime_ns and now - cached[2] < self.status_cache_ttl:
+            return cached[0]
+        
+        total_size = _tree_size(path)
+        self._size_cache[key] = (total_size, dir_mtime_ns, now)
+        return total_size
+    
     def set_compliance_hold(self, data_type: DataType, enabled: bool = True):
         """Set or remove compliance hold on data type"""
         if data_type in self.policies:
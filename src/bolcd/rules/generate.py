@@ -1,31 +1,53 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 
 def build_suppression_rules(graph: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Create minimal suppression rules for A->C when A->B and B->C exist.
 
+    One rule is emitted per (A, C, segment), explained by the first such B.
     Returns a common rule format: {name, segment, spl|kql|detector}
     """
+    return list(iter_suppression_rules(graph))
+
+
+def iter_suppression_rules(graph: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the rules of build_suppression_rules one at a time.
+
+    Lets callers stream rules to a writer without materializing the list.
+    """
     edges = [(e.get("src"), e.get("dst"), e.get("segment")) for e in graph.get("edges", [])]
     by_seg: Dict[str, List[tuple[str, str]]] = {}
     for u, v, seg in edges:
         by_seg.setdefault(seg or "__all__", []).append((u, v))
 
-    rules: List[Dict[str, Any]] = []
     for seg, ev in by_seg.items():
-        pairs = set(ev)
-        # For all A->B and B->C, suppress A->C
-        for a, b in ev:
-            for x, c in ev:
-                if x == b and (a, c) in pairs and a != c:
-                    name = f"bolcd_suppress_{a}_{c}_{seg}"
+        # Ordered successor sets: O(1) membership, deterministic iteration
+        succ: Dict[str, Dict[str, None]] = {}
+        for u, v in ev:
+            succ.setdefault(u, {})[v] = None
+        # Only nodes with both an incoming and an outgoing edge can be a B;
+        # without any, the segment has no path of length 2
+        mids = {v for _, v in ev if v in succ}
+        if not mids:
+            continue
+        # For each A->C, suppress it if some A->B and B->C exist
+        for a, cs in succ.items():
+            if mids.isdisjoint(cs):
+                continue
+            for c in cs:
+                if a == c:
+                    continue
+                b = next((b for b in cs if c in succ.get(b, ())), None)
+                if b is not None:
                     # SPL / KQL simple examples referencing fields a and c
-                    spl = f"search {a}=* {c}=* | eval suppressed='via {b}'"
-                    kql = f"{a}:* and {c}:* | project suppressed='via {b}'"
-                    detector = {"rule": "suppress", "via": b, "src": a, "dst": c, "segment": seg}
-                    rules.append({"name": name, "segment": seg, "spl": spl, "kql": kql, "detector": detector})
-    return rules
+                    yield {
+                        "name": "bolcd_suppress_%s_%s_%s" % (a, c, seg),
+                        "segment": seg,
+                        "spl": "search %s=* %s=* | eval suppressed='via %s'" % (a, c, b),
+                        "kql": "%s:* and %s:* | project suppressed='via %s'" % (a, c, b),
+                        "detector": {"rule": "suppress", "via": b, "src": a, "dst": c, "segment": seg},
+                    }
 
 
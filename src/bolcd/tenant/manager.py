@@ -5,17 +5,100 @@ This module provides tenant isolation, resource management, and access control
 for enterprise deployments supporting multiple organizations.
 """
 
+import os
+import atexit
+import mmap
 import uuid
+import base64
+import functools
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Any, TextIO, Tuple
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
 import hashlib
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+# Rewrite the snapshot and truncate the change log once the log exceeds this size
+COMPACT_THRESHOLD_BYTES = 1024 * 1024
+
+# Mutations within this window are coalesced into a single change-log write
+FLUSH_DELAY_SECONDS = 0.05
+
+# How long a tenant's usage.json contents are reused by check_quota
+USAGE_CACHE_TTL_SECONDS = 1.0
+
+# Fields update_tenant is allowed to change
+_UPDATE_ALLOWED = frozenset({
+    'name', 'organization', 'max_events_per_day', 'max_rules',
+    'max_users', 'max_api_calls_per_hour', 'storage_quota_gb',
+    'features', 'settings', 'active', 'suspended_reason'
+})
+
+
+def _json_default(obj: Any) -> Any:
+    """json fallback for objects orjson serializes natively (TenantConfig)."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(data: Any, indent: bool = True) -> bytes:
+    """Serialize tenant state as JSON bytes (indented for the snapshot).
+    
+    TenantConfig values may be passed as-is: orjson writes dataclasses
+    directly without building an intermediate dict.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, indent=2 if indent else None, default=_json_default).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes written by _json_dumps."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _iter_snapshot_tenants(config_file: Path) -> Iterator[Dict[str, Any]]:
+    """Yield tenant dicts from a tenants.json snapshot.
+    
+    With ijson installed the file is stream-parsed, so only one tenant's
+    data is held at a time instead of the whole document.
+    """
+    if IJSON_AVAILABLE:
+        with open(config_file, 'rb') as f:
+            yield from ijson.items(f, 'tenants.item', use_float=True)
+    else:
+        yield from _json_loads(config_file.read_bytes()).get('tenants', [])
+
 
 @dataclass
 class TenantConfig:
@@ -64,6 +147,40 @@ class TenantConfig:
             self.siem_configs = []
         if self.settings is None:
             self.settings = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict for serialization (dataclasses.asdict deep-copies every field)."""
+        return {
+            'tenant_id': self.tenant_id,
+            'name': self.name,
+            'organization': self.organization,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'max_events_per_day': self.max_events_per_day,
+            'max_rules': self.max_rules,
+            'max_users': self.max_users,
+            'max_api_calls_per_hour': self.max_api_calls_per_hour,
+            'storage_quota_gb': self.storage_quota_gb,
+            'features': self.features,
+            'siem_configs': self.siem_configs,
+            'settings': self.settings,
+            'active': self.active,
+            'suspended_reason': self.suspended_reason,
+        }
+    
+    def limit_for(self, resource: str) -> float:
+        """Quota limit for a resource type (storage in bytes); unknown resources are unlimited."""
+        if resource == 'events':
+            return self.max_events_per_day
+        if resource == 'api_calls':
+            return self.max_api_calls_per_hour
+        if resource == 'storage':
+            return self.storage_quota_gb * 1024 * 1024 * 1024  # Convert to bytes
+        if resource == 'rules':
+            return self.max_rules
+        if resource == 'users':
+            return self.max_users
+        return float('inf')
 
 
 class TenantManager:
@@ -79,36 +196,156 @@ class TenantManager:
         self.data_dir = data_dir or Path('/var/lib/bolcd/tenants')
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.tenants: Dict[str, TenantConfig] = {}
+        self._dirty: set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Guards self.tenants, tenant fields and the dirty set; held only for
+        # in-memory work. Disk I/O happens under _write_lock on the flush timer.
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        # tenant_id -> (loaded_at, usage counters)
+        self._usage_cache: Dict[str, Tuple[float, Dict[str, int]]] = {}
         self._load_tenants()
     
+    @property
+    def _log_file(self) -> Path:
+        return self.data_dir / 'tenants.log.jsonl'
+    
     def _load_tenants(self):
-        """Load tenant configurations from disk."""
+        """Load the snapshot (tenants.msgpack or tenants.json), then replay the change log on top."""
+        msgpack_file = self.data_dir / 'tenants.msgpack'
         config_file = self.data_dir / 'tenants.json'
-        if config_file.exists():
+        try:
+            if msgpack_file.exists() and MSGPACK_AVAILABLE:
+                snapshot = msgpack.unpackb(msgpack_file.read_bytes(), raw=False).get('tenants', [])
+            elif config_file.exists():
+                snapshot = _iter_snapshot_tenants(config_file)
+            else:
+                snapshot = []
+                if msgpack_file.exists():
+                    logger.error("tenants.msgpack found but msgpack is not installed")
+            for tenant_data in snapshot:
+                tenant = TenantConfig(**tenant_data)
+                self.tenants[tenant.tenant_id] = tenant
+        except Exception as e:
+            logger.error(f"Failed to load tenants: {e}")
+        
+        if self._log_file.exists():
             try:
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-                    for tenant_data in data.get('tenants', []):
-                        tenant = TenantConfig(**tenant_data)
-                        self.tenants[tenant.tenant_id] = tenant
-                logger.info(f"Loaded {len(self.tenants)} tenants")
+                with open(self._log_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            change = _json_loads(line)
+                        except ValueError:
+                            # Torn final line from an interrupted append
+                            logger.warning("Skipping unreadable tenant change log entry")
+                            continue
+                        if change.get('op') == 'upsert':
+                            tenant = TenantConfig(**change['tenant'])
+                            self.tenants[tenant.tenant_id] = tenant
+                        elif change.get('op') == 'delete':
+                            self.tenants.pop(change['tenant_id'], None)
             except Exception as e:
-                logger.error(f"Failed to load tenants: {e}")
+                logger.error(f"Failed to replay tenant change log: {e}")
+        
+        logger.info(f"Loaded {len(self.tenants)} tenants")
     
-    def _save_tenants(self):
-        """Persist tenant configurations to disk."""
-        config_file = self.data_dir / 'tenants.json'
-        try:
+    def _mark_dirty(self, tenant_id: str):
+        """Queue a tenant for the next change-log flush.
+        
+        Bursts of mutations (e.g. onboarding many tenants) are coalesced by a
+        short timer into one append holding the latest state of each tenant.
+        """
+        self._usage_cache.pop(tenant_id, None)
+        with self._lock:
+            self._dirty.add(tenant_id)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DELAY_SECONDS, self.flush)
+                self._flush_timer.start()
+    
+    def flush(self):
+        """Write pending tenant changes to the append-only change log now.
+        
+        Call on shutdown, or before another process needs to read the state.
+        The log is folded back into the snapshot once it grows large.
+        """
+        with self._write_lock:
+            # Serialize under the lock so a concurrent update cannot tear a
+            # record; _write_lock keeps appends in snapshot order
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                dirty, self._dirty = self._dirty, set()
+                lines = []
+                for tenant_id in dirty:
+                    tenant = self.tenants.get(tenant_id)
+                    if tenant is None:
+                        change = {'op': 'delete', 'tenant_id': tenant_id}
+                    else:
+                        change = {'op': 'upsert', 'tenant': tenant}
+                    lines.append(_json_dumps(change, indent=False) + b'\n')
+            if not lines:
+                return
+            try:
+                with open(self._log_file, 'ab') as f:
+                    f.write(b''.join(lines))
+                    size = f.tell()
+            except Exception as e:
+                logger.error(f"Failed to record tenant changes: {e}")
+                return
+            if size > COMPACT_THRESHOLD_BYTES:
+                self._compact()
+    
+    def _compact(self):
+        """Write a fresh snapshot and truncate the change log."""
+        if self._save_tenants():
+            # Replaying a stale log over the new snapshot is harmless, so a crash
+            # between these two steps cannot lose changes
+            self._log_file.write_bytes(b"")
+    
+    def _snapshot(self, binary: bool) -> Tuple[int, bytes]:
+        """Serialize all tenants as (count, MessagePack or indented JSON bytes)."""
+        with self._lock:
             data = {
                 'version': '1.0',
                 'updated': datetime.now(timezone.utc).isoformat(),
-                'tenants': [asdict(t) for t in self.tenants.values()]
+                'tenants': list(self.tenants.values())
             }
-            with open(config_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved {len(self.tenants)} tenants")
+            if binary:
+                return len(data['tenants']), msgpack.packb(data, use_bin_type=True, default=_json_default)
+            return len(data['tenants']), _json_dumps(data)
+    
+    def _save_tenants(self) -> bool:
+        """Persist a snapshot of all tenant configurations to disk.
+        
+        The snapshot is MessagePack (tenants.msgpack) when msgpack is
+        installed, which is smaller and much faster to load than JSON;
+        use export_json() for a human-readable copy.
+        """
+        if MSGPACK_AVAILABLE:
+            config_file = self.data_dir / 'tenants.msgpack'
+        else:
+            config_file = self.data_dir / 'tenants.json'
+        try:
+            count, payload = self._snapshot(binary=MSGPACK_AVAILABLE)
+            # Write to a temp file and rename so readers never see a partial file
+            tmp_file = config_file.with_suffix('.tmp')
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, config_file)
+            if MSGPACK_AVAILABLE:
+                # A leftover JSON snapshot would be stale once the log is truncated
+                (self.data_dir / 'tenants.json').unlink(missing_ok=True)
+            logger.info(f"Saved {count} tenants")
+            return True
         except Exception as e:
             logger.error(f"Failed to save tenants: {e}")
+            return False
+    
+    def export_json(self, path: Optional[Path] = None) -> Path:
+        """Write all tenant configurations as indented JSON for admin tooling."""
+        path = path or self.data_dir / 'tenants.export.json'
+        path.write_bytes(self._snapshot(binary=False)[1])
+        return path
     
     def create_tenant(self, 
                      name: str, 
@@ -147,8 +384,9 @@ class TenantManager:
         (tenant_dir / 'reports').mkdir(exist_ok=True)
         (tenant_dir / 'logs').mkdir(exist_ok=True)
         
-        self.tenants[tenant_id] = tenant
-        self._save_tenants()
+        with self._lock:
+            self.tenants[tenant_id] = tenant
+            self._mark_dirty(tenant_id)
         
         logger.info(f"Created tenant: {tenant_id} ({name})")
         return tenant
@@ -168,23 +406,18 @@ class TenantManager:
         Returns:
             Updated tenant configuration or None if not found
         """
-        tenant = self.tenants.get(tenant_id)
-        if not tenant:
-            return None
-        
-        # Update allowed fields
-        allowed_fields = {
-            'name', 'organization', 'max_events_per_day', 'max_rules',
-            'max_users', 'max_api_calls_per_hour', 'storage_quota_gb',
-            'features', 'settings', 'active', 'suspended_reason'
-        }
-        
-        for field, value in updates.items():
-            if field in allowed_fields and hasattr(tenant, field):
-                setattr(tenant, field, value)
-        
-        tenant.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_tenants()
+        with self._lock:
+            tenant = self.tenants.get(tenant_id)
+            if not tenant:
+                return None
+            
+            # Update allowed fields
+            for field, value in updates.items():
+                if field in _UPDATE_ALLOWED:
+                    setattr(tenant, field, value)
+            
+            tenant.updated_at = datetime.now(timezone.utc).isoformat()
+            self._mark_dirty(tenant_id)
         
         logger.info(f"Updated tenant: {tenant_id}")
         return tenant
@@ -200,13 +433,12 @@ class TenantManager:
         Returns:
             True if successful
         """
-        tenant = self.tenants.get(tenant_id)
-        if not tenant:
-            return False
-        
         if hard_delete:
             # Remove from memory
-            del self.tenants[tenant_id]
+            with self._lock:
+                if self.tenants.pop(tenant_id, None) is None:
+                    return False
+                self._mark_dirty(tenant_id)
             
             # Archive tenant directory (don't delete immediately)
             tenant_dir = self.data_dir / tenant_id
@@ -218,12 +450,16 @@ class TenantManager:
             logger.info(f"Hard deleted tenant: {tenant_id}")
         else:
             # Soft delete - just deactivate
-            tenant.active = False
-            tenant.suspended_reason = "Deleted by admin"
-            tenant.updated_at = datetime.now(timezone.utc).isoformat()
+            with self._lock:
+                tenant = self.tenants.get(tenant_id)
+                if not tenant:
+                    return False
+                tenant.active = False
+                tenant.suspended_reason = "Deleted by admin"
+                tenant.updated_at = datetime.now(timezone.utc).isoformat()
+                self._mark_dirty(tenant_id)
             logger.info(f"Deactivated tenant: {tenant_id}")
         
-        self._save_tenants()
         return True
     
     def list_tenants(self, active_only: bool = True) -> List[TenantConfig]:
@@ -236,7 +472,8 @@ class TenantManager:
         Returns:
             List of tenant configurations
         """
-        tenants = list(self.tenants.values())
+        with self._lock:
+            tenants = list(self.tenants.values())
         if active_only:
             tenants = [t for t in tenants if t.active]
         return tenants
@@ -261,16 +498,7 @@ class TenantManager:
         usage = self._get_resource_usage(tenant_id, resource)
         
         # Check against limits
-        limits = {
-            'events': tenant.max_events_per_day,
-            'rules': tenant.max_rules,
-            'users': tenant.max_users,
-            'api_calls': tenant.max_api_calls_per_hour,
-            'storage': tenant.storage_quota_gb * 1024 * 1024 * 1024  # Convert to bytes
-        }
-        
-        limit = limits.get(resource, float('inf'))
-        return (usage + amount) <= limit
+        return (usage + amount) <= tenant.limit_for(resource)
     
     def _get_resource_usage(self, tenant_id: str, resource: str) -> int:
         """
@@ -278,17 +506,24 @@ class TenantManager:
         
         This is a simplified implementation. In production, this would
         query actual usage from databases, metrics systems, etc.
+        Usage is cached per tenant for USAGE_CACHE_TTL_SECONDS so bursts of
+        quota checks do not re-read the file.
         """
+        now = time.monotonic()
+        cached = self._usage_cache.get(tenant_id)
+        if cached and now - cached[0] < USAGE_CACHE_TTL_SECONDS:
+            return cached[1].get(resource, 0)
+        
         # Placeholder implementation
+        usage: Dict[str, int] = {}
         usage_file = self.data_dir / tenant_id / 'usage.json'
         if usage_file.exists():
             try:
-                with open(usage_file, 'r') as f:
-                    usage = json.load(f)
-                    return usage.get(resource, 0)
+                usage = _json_loads(usage_file.read_bytes())
             except Exception:
                 pass
-        return 0
+        self._usage_cache[tenant_id] = (now, usage)
+        return usage.get(resource, 0)
     
     def get_tenant_dir(self, tenant_id: str, subdir: Optional[str] = None) -> Optional[Path]:
         """
@@ -337,16 +572,24 @@ class TenantManager:
             'added_at': datetime.now(timezone.utc).isoformat()
         }
         
-        tenant.siem_configs.append(siem_config)
-        tenant.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_tenants()
+        with self._lock:
+            tenant.siem_configs.append(siem_config)
+            tenant.updated_at = datetime.now(timezone.utc).isoformat()
+            self._mark_dirty(tenant_id)
         
         logger.info(f"Added {siem_type} config for tenant: {tenant_id}")
         return True
 
 
 class TenantContext:
-    """Context manager for tenant-scoped operations."""
+    """Context manager for tenant-scoped operations.
+    
+    Contexts are meant to be short-lived (per request): feature flags and
+    settings are bound at construction, so a later update_tenant that
+    replaces those dicts is seen by new contexts only.
+    """
+    
+    __slots__ = ('manager', 'tenant_id', 'tenant', '_features', '_settings')
     
     def __init__(self, manager: TenantManager, tenant_id: str):
         """
@@ -364,10 +607,13 @@ class TenantContext:
             raise ValueError(f"Tenant not found: {tenant_id}")
         if not self.tenant.active:
             raise ValueError(f"Tenant is not active: {tenant_id}")
+        
+        self._features = self.tenant.features
+        self._settings = self.tenant.settings
     
     def check_feature(self, feature: str) -> bool:
         """Check if a feature is enabled for this tenant."""
-        return self.tenant.features.get(feature, False)
+        return self._features.get(feature, False)
     
     def check_quota(self, resource: str, amount: int = 1) -> bool:
         """Check if tenant has quota for a resource."""
@@ -379,7 +625,7 @@ class TenantContext:
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a tenant-specific setting."""
-        return self.tenant.settings.get(key, default)
+        return self._settings.get(key, default)
 
 
 # Global tenant manager instance
@@ -408,6 +654,76 @@ def get_tenant_context(tenant_id: str) -> TenantContext:
     return TenantContext(manager, tenant_id)
 
 
+@functools.lru_cache(maxsize=8192)
+def _tenant_hash16(tenant_id: str) -> str:
+    """Hex SHA-256 prefix used to name a tenant's isolated storage and database"""
+    return hashlib.sha256(tenant_id.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=4096)
+def _derive_tenant_key(tenant_id: str) -> bytes:
+    """Derive the tenant's Fernet key; PBKDF2 is deliberately slow, so run it once per tenant"""
+    key_material = hashlib.pbkdf2_hmac(
+        'sha256',
+        tenant_id.encode(),
+        b'bolcd_salt_v1',  # Static salt for key derivation
+        100000
+    )
+    return base64.urlsafe_b64encode(key_material[:32])
+
+
+@functools.lru_cache(maxsize=4096)
+def _fernet_for(tenant_id: str):
+    """Per-tenant Fernet instance, reused across encrypt/decrypt calls"""
+    from cryptography.fernet import Fernet
+    return Fernet(_derive_tenant_key(tenant_id))
+
+
+# Tenant audit records are written and flushed one per call, so nothing is lost
+# on a crash, through persistent per-tenant handles. A handle is reopened when
+# audit.jsonl no longer is the file it points at (moved by retention, rotated).
+AUDIT_MAX_OPEN_HANDLES = 256
+
+_audit_lock = threading.Lock()
+_audit_handles: Dict[str, Tuple[Path, TextIO]] = {}
+
+
+def _audit_handle(tenant_id: str) -> TextIO:
+    """Append handle for the tenant's current audit.jsonl; caller holds _audit_lock."""
+    cached = _audit_handles.pop(tenant_id, None)
+    if cached is not None:
+        audit_path, f = cached
+        try:
+            if os.path.samestat(os.stat(audit_path), os.fstat(f.fileno())):
+                _audit_handles[tenant_id] = cached
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+    if len(_audit_handles) >= AUDIT_MAX_OPEN_HANDLES:
+        _close_audit_handles()
+    audit_path = TenantIsolation.get_isolated_storage_path(tenant_id) / "audit.jsonl"
+    f = open(audit_path, "a")
+    _audit_handles[tenant_id] = (audit_path, f)
+    return f
+
+
+def _close_audit_handles():
+    """Close all cached audit handles; caller holds _audit_lock."""
+    for _, f in _audit_handles.values():
+        f.close()
+    _audit_handles.clear()
+
+
+def close_audit_logs():
+    """Close all cached tenant audit handles."""
+    with _audit_lock:
+        _close_audit_handles()
+
+
+atexit.register(close_audit_logs)
+
+
 class TenantIsolation:
     """Enhanced tenant isolation with complete data separation"""
     
@@ -420,7 +736,7 @@ class TenantIsolation:
     def get_isolated_storage_path(tenant_id: str) -> Path:
         """Get completely isolated storage path for tenant"""
         # Use hashed tenant ID for security
-        tenant_hash = hashlib.sha256(tenant_id.encode()).hexdigest()[:16]
+        tenant_hash = _tenant_hash16(tenant_id)
         tenant_path = Path(f"./data/tenants/{tenant_hash}")
         tenant_path.mkdir(parents=True, exist_ok=True, mode=0o700)  # Restricted permissions
         return tenant_path
@@ -432,7 +748,7 @@ class TenantIsolation:
         from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
         
         # Generate unique database name
-        db_name = f"bolcd_tenant_{hashlib.md5(tenant_id.encode()).hexdigest()[:8]}"
+        db_name = f"bolcd_tenant_{_tenant_hash16(tenant_id)[:8]}"
         
         try:
             # Connect to PostgreSQL
@@ -466,40 +782,29 @@ class TenantIsolation:
     @staticmethod
     def encrypt_tenant_data(data: bytes, tenant_id: str) -> bytes:
         """Encrypt data using tenant-specific key"""
-        from cryptography.fernet import Fernet
-        import base64
-        
-        # Generate tenant-specific key
-        key_material = hashlib.pbkdf2_hmac(
-            'sha256',
-            tenant_id.encode(),
-            b'bolcd_salt_v1',  # Static salt for key derivation
-            100000
-        )
-        key = base64.urlsafe_b64encode(key_material[:32])
-        
-        # Encrypt data
-        f = Fernet(key)
-        return f.encrypt(data)
+        return _fernet_for(tenant_id).encrypt(data)
     
     @staticmethod
     def decrypt_tenant_data(encrypted_data: bytes, tenant_id: str) -> bytes:
         """Decrypt data using tenant-specific key"""
-        from cryptography.fernet import Fernet
-        import base64
-        
-        # Generate tenant-specific key
-        key_material = hashlib.pbkdf2_hmac(
-            'sha256',
-            tenant_id.encode(),
-            b'bolcd_salt_v1',
-            100000
-        )
-        key = base64.urlsafe_b64encode(key_material[:32])
+        return _fernet_for(tenant_id).decrypt(encrypted_data)
+    
+    @staticmethod
+    def read_audit(tenant_id: str) -> Optional[mmap.mmap]:
+        """Map the tenant's audit.jsonl copy-on-write for readers.
         
-        # Decrypt data
-        f = Fernet(key)
-        return f.decrypt(encrypted_data)
+        Pages are shared with the OS cache and only faulted in as they are
+        sliced; the caller should close the mapping. Returns None when the
+        tenant has no audit records yet.
+        """
+        audit_path = TenantIsolation.get_isolated_storage_path(tenant_id) / "audit.jsonl"
+        try:
+            with open(audit_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except FileNotFoundError:
+            return None
     
     @staticmethod
     def validate_tenant_access(tenant_id: str, user_id: str, resource: str) -> bool:
@@ -532,7 +837,9 @@ class TenantIsolation:
             "success": success
         }
         
-        # Write to tenant-specific audit log
-        audit_path = TenantIsolation.get_isolated_storage_path(tenant_id) / "audit.jsonl"
-        with open(audit_path, "a") as f:
-            f.write(json.dumps(audit_entry) + "\n")
+        # Append to the tenant-specific audit log; see _audit_handle
+        line = json.dumps(audit_entry) + "\n"
+        with _audit_lock:
+            f = _audit_handle(tenant_id)
+            f.write(line)
+            f.flush()
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Response
+import gzip
+import hashlib
+
+from fastapi import APIRouter, Request, Response
+
+from .http_cache import etag_matches
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 router = APIRouter()
 
 
-@router.get("/dashboard")
-def dashboard() -> Response:
-    # Simple D3 force graph + controls (recompute, segment filters)
-    html = """
+# Canvas graph streamed from /api/graph/stream, plus a recompute form (fdr_q, epsilon) and an audit viewer
+_HTML = """
 <!doctype html>
 <html>
 <head>
@@ -29,27 +38,34 @@ def dashboard() -> Response:
   </style>
   <script>
     (function(){
-      var SVGNS = 'http://www.w3.org/2000/svg';
       function byId(id){ return document.getElementById(id); }
 
+      // Draw into one <canvas> with a handful of batched path operations
+      // (all edges, all arrowheads, all nodes) instead of one DOM element per
+      // datum, so large graphs cost draw calls rather than layout/style work
       function render(graph){
         var chart = byId('chart');
-        while (chart.firstChild) chart.removeChild(chart.firstChild);
         var w = chart.clientWidth || 900;
         var h = chart.clientHeight || 520;
-        var svg = document.createElementNS(SVGNS, 'svg');
-        svg.setAttribute('width', w);
-        svg.setAttribute('height', h);
-        svg.setAttribute('viewBox', '0 0 '+w+' '+h);
-        chart.appendChild(svg);
-
-        var defs = document.createElementNS(SVGNS, 'defs');
-        var m = document.createElementNS(SVGNS, 'marker');
-        m.setAttribute('id','arrow'); m.setAttribute('viewBox','0 -5 10 10');
-        m.setAttribute('refX','12'); m.setAttribute('refY','0');
-        m.setAttribute('markerWidth','6'); m.setAttribute('markerHeight','6'); m.setAttribute('orient','auto');
-        var p = document.createElementNS(SVGNS, 'path'); p.setAttribute('d','M0,-5L10,0L0,5'); p.setAttribute('fill','#888');
-        m.appendChild(p); defs.appendChild(m); svg.appendChild(defs);
+        var dpr = window.devicePixelRatio || 1;
+        var canvas = chart.firstChild;
+        if (!canvas || canvas.tagName !== 'CANVAS'){
+          chart.textContent = '';
+          canvas = document.createElement('canvas');
+          chart.appendChild(canvas);
+        }
+        // The canvas persists across redraws; only reallocate its backing
+        // store when the chart size or pixel ratio actually changed
+        var cw = Math.round(w * dpr), ch = Math.round(h * dpr);
+        if (canvas.width !== cw || canvas.height !== ch){
+          canvas.width = cw;
+          canvas.height = ch;
+          canvas.style.width = w + 'px';
+          canvas.style.height = h + 'px';
+        }
+        var ctx = canvas.getContext('2d');
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, w, h);
 
         var nodes = (graph.nodes || []).slice();
         var edges = (graph.edges || []).slice();
@@ -61,25 +77,77 @@ def dashboard() -> Response:
           pos[nodes[i]] = {x:x,y:y};
         }
 
+        var R = 7, HEAD = 10;
+        var links = new Path2D(), heads = new Path2D();
         for (var j=0;j<edges.length;j++){
           var e = edges[j], s = pos[e.src], t = pos[e.dst];
           if (!s || !t) continue;
-          var line = document.createElementNS(SVGNS, 'line');
-          line.setAttribute('x1', s.x); line.setAttribute('y1', s.y);
-          line.setAttribute('x2', t.x); line.setAttribute('y2', t.y);
-          line.setAttribute('stroke', '#888'); line.setAttribute('stroke-width','2');
-          line.setAttribute('marker-end','url(#arrow)'); svg.appendChild(line);
+          links.moveTo(s.x, s.y); links.lineTo(t.x, t.y);
+          var dx = t.x - s.x, dy = t.y - s.y, len = Math.sqrt(dx*dx + dy*dy);
+          if (!len) continue;
+          var ux = dx/len, uy = dy/len;
+          var tipX = t.x - ux*R, tipY = t.y - uy*R;
+          var baseX = tipX - ux*HEAD, baseY = tipY - uy*HEAD;
+          heads.moveTo(tipX, tipY);
+          heads.lineTo(baseX - uy*HEAD/2, baseY + ux*HEAD/2);
+          heads.lineTo(baseX + uy*HEAD/2, baseY - ux*HEAD/2);
+          heads.closePath();
         }
+        ctx.strokeStyle = '#888'; ctx.lineWidth = 2; ctx.stroke(links);
+        ctx.fillStyle = '#888'; ctx.fill(heads);
+
+        var dots = new Path2D();
         for (var k=0;k<n;k++){
-          var c = document.createElementNS(SVGNS, 'circle');
-          c.setAttribute('cx', pos[nodes[k]].x); c.setAttribute('cy', pos[nodes[k]].y);
-          c.setAttribute('r','7'); c.setAttribute('fill','#4285f4'); svg.appendChild(c);
-          var t = document.createElementNS(SVGNS, 'text'); t.setAttribute('x', pos[nodes[k]].x + 10);
-          t.setAttribute('y', pos[nodes[k]].y + 4); t.setAttribute('font-size','12'); t.textContent = nodes[k]; svg.appendChild(t);
+          var p = pos[nodes[k]];
+          dots.moveTo(p.x + R, p.y); dots.arc(p.x, p.y, R, 0, 2*Math.PI);
+        }
+        ctx.fillStyle = '#4285f4'; ctx.fill(dots);
+
+        ctx.fillStyle = '#000'; ctx.font = '12px sans-serif';
+        for (var m=0;m<n;m++){
+          var q = pos[nodes[m]];
+          if (q.x > w) break;  // labels past the right edge are never visible
+          ctx.fillText(String(nodes[m]), q.x + 10, q.y + 4);
         }
       }
 
-      function loadGraph(){ fetch('/api/graph').then(function(r){ return r.json(); }).then(render); }
+      // Resize events and graph loads can arrive many times per frame; keep
+      // only the latest graph and redraw at most once per animation frame
+      var lastGraph = null, rafId = 0;
+      function scheduleRender(graph){
+        if (graph) lastGraph = graph;
+        if (!rafId) rafId = window.requestAnimationFrame(function(){ rafId = 0; if (lastGraph) render(lastGraph); });
+      }
+
+      function addRecord(graph, line){
+        if (!line) return;
+        var rec = JSON.parse(line);
+        if (rec.type === 'node') graph.nodes.push(rec.id);
+        else if (rec.type === 'edge') graph.edges.push(rec);
+      }
+
+      // Read /api/graph/stream incrementally so nodes are drawn while the
+      // rest of the edge list is still arriving
+      function loadGraph(){
+        var graph = {nodes: [], edges: []};
+        fetch('/api/graph/stream').then(function(r){
+          if (!r.ok || !r.body || !r.body.getReader || !window.TextDecoder){
+            return fetch('/api/graph').then(function(r2){ return r2.json(); }).then(scheduleRender);
+          }
+          var reader = r.body.getReader(), decoder = new TextDecoder(), rest = '';
+          function pump(){
+            return reader.read().then(function(chunk){
+              rest += decoder.decode(chunk.value || new Uint8Array(0), {stream: !chunk.done});
+              var lines = rest.split('\\n');
+              rest = chunk.done ? '' : lines.pop();
+              for (var i=0;i<lines.length;i++) addRecord(graph, lines[i]);
+              scheduleRender(graph);
+              if (!chunk.done) return pump();
+            });
+          }
+          return pump();
+        });
+      }
       window.runRecompute = function(){
         var key = byId('apikey').value.trim();
         var fdrq = parseFloat(byId('fdrq').value);
@@ -95,10 +163,11 @@ def dashboard() -> Response:
         var key = v || op;
         fetch('/api/audit', { headers: { 'X-API-Key': key || '' }})
           .then(function(r){ if(!r.ok){ byId('audit').textContent = 'Audit fetch failed: '+r.status; return null; } return r.json(); })
-          .then(function(data){ if(!data) return; var lines = data.map(function(e){ var ts=e.ts||''; var actor=e.actor||''; var action=e.action||''; var edges=(e.diff&&e.diff.edges!=null)?e.diff.edges:''; var nodes=(e.diff&&e.diff.nodes!=null)?e.diff.nodes:''; return ts+' | '+actor+' | '+action+' | edges='+edges+' nodes='+nodes;}); byId('audit').textContent = lines.join('\n'); });
+          .then(function(data){ if(!data) return; var lines = data.map(function(e){ var ts=e.ts||''; var actor=e.actor||''; var action=e.action||''; var edges=(e.diff&&e.diff.edges!=null)?e.diff.edges:''; var nodes=(e.diff&&e.diff.nodes!=null)?e.diff.nodes:''; return ts+' | '+actor+' | '+action+' | edges='+edges+' nodes='+nodes;}); byId('audit').textContent = lines.join('\\n'); });
       };
       function init(){ var saved=localStorage.getItem('bolcd_apikey'); if(saved) byId('apikey').value=saved; loadGraph(); }
       window.addEventListener('DOMContentLoaded', init);
+      window.addEventListener('resize', function(){ scheduleRender(); });
     })();
   </script>
 </head>
@@ -124,12 +193,49 @@ def dashboard() -> Response:
 </body>
 </html>
     """
-    return Response(
-        content=html,
-        media_type="text/html",
-        headers={
-            "Cache-Control": "no-store, max-age=0",
-            "Pragma": "no-cache",
-        },
+
+# The page is static: encode and compress it once at import, not per request
+_HTML_BYTES = _HTML.encode("utf-8")
+_HTML_GZIP = gzip.compress(_HTML_BYTES, compresslevel=9)
+_HTML_BR = brotli.compress(_HTML_BYTES, quality=11) if BROTLI_AVAILABLE else None
+# Each encoding is a distinct representation, so each gets its own strong ETag
+_ETAG = '"' + hashlib.sha256(_HTML_BYTES).hexdigest()[:16] + '"'
+_ETAG_GZIP = _ETAG[:-1] + '-gzip"'
+_ETAG_BR = _ETAG[:-1] + '-br"'
+
+# (content-coding, body, etag) in order of preference
+_VARIANTS = [("gzip", _HTML_GZIP, _ETAG_GZIP)]
+if _HTML_BR is not None:
+    _VARIANTS.insert(0, ("br", _HTML_BR, _ETAG_BR))
+
+
+def _accepted_codings(accept_encoding: str) -> set[str]:
+    """Content-codings listed in Accept-Encoding, minus any refused with q=0."""
+    codings = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        q = params.strip().removeprefix("q=")
+        if q and q.strip("0.") == "":
+            continue
+        codings.add(coding.strip().lower())
+    return codings
+
+
+@router.get("/dashboard")
+def dashboard(request: Request) -> Response:
+    accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+    coding, body, etag = next(
+        (v for v in _VARIANTS if v[0] in accepted), ("identity", _HTML_BYTES, _ETAG)
     )
+    headers = {
+        # Browsers keep the page but revalidate every load; unchanged pages cost a 304
+        "Cache-Control": "public, max-age=0, must-revalidate",
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="text/html", headers=headers)
 
@@ -1,65 +1,128 @@
 from __future__ import annotations
 
 import json
+import math
 from pathlib import Path
-from xml.etree.ElementTree import Element, SubElement, tostring
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, TextIO
+from xml.sax.saxutils import escape
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def to_graphml(graph: Dict[str, Any]) -> str:
+GRAPHML_NS = "http://graphml.graphdrawing.org/xmlns"
+
+# Edges serialized between chunks yielded by iter_graphml
+GRAPHML_CHUNK_EDGES = 1000
+
+_GRAPHML_KEYS = (
+    ("d0", "n_src1", "int"),
+    ("d1", "k_counterex", "int"),
+    ("d2", "ci95_upper", "double"),
+    ("d3", "q_value", "double"),
+)
+
+# Fixed document prologue: root element, key declarations, graph element
+_GRAPHML_HEAD = (
+    f'<graphml xmlns="{GRAPHML_NS}">'
+    + "".join(
+        f'<key id="{key_id}" for="edge" attr.name="{name}" attr.type="{attr_type}"/>'
+        for key_id, name, attr_type in _GRAPHML_KEYS
+    )
+    + '<graph edgedefault="directed">'
+)
+_GRAPHML_TAIL = "</graph></graphml>"
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+
+def _graphml_parts(graph: Dict[str, Any]) -> Iterator[List[str]]:
+    """
+    Yield lists of GraphML fragments, GRAPHML_CHUNK_EDGES edges at a time.
+
+    The schema is flat, so elements are written from string templates rather
+    than an element tree. Node ids are the only free text and are escaped
+    once each; the numeric fields need no escaping.
+    """
+    escaped: Dict[str, str] = {}
+    parts: List[str] = [_GRAPHML_HEAD]
+    append = parts.append
+    for node in graph.get("nodes", []):
+        esc = escaped[node] = escape(node, _ATTR_ENTITIES)
+        append(f'<node id="{esc}"/>')
+
+    for idx, e in enumerate(graph.get("edges", [])):
+        src, dst, qv = e["src"], e["dst"], e.get("q_value")
+        src = escaped.get(src) or escape(src, _ATTR_ENTITIES)
+        dst = escaped.get(dst) or escape(dst, _ATTR_ENTITIES)
+        append(
+            f'<edge id="e{idx}" source="{src}" target="{dst}">'
+            f'<data key="d0">{e.get("n_src1", 0)}</data>'
+            f'<data key="d1">{e.get("k_counterex", 0)}</data>'
+            f'<data key="d2">{e.get("ci95_upper", 0.0)}</data>'
+            f'<data key="d3">{"" if qv is None else qv}</data>'
+            "</edge>"
+        )
+        if idx % GRAPHML_CHUNK_EDGES == GRAPHML_CHUNK_EDGES - 1:
+            yield parts
+            parts = []
+            append = parts.append
+
+    append(_GRAPHML_TAIL)
+    yield parts
+
+
+def fast_to_graphml(graph: Dict[str, Any]) -> str:
     """
     Convert a graph dict {nodes: [str], edges: [{src, dst, n_src1, k_counterex, ci95_upper, q_value}]}
     into a minimal GraphML string.
     """
-    gml = Element("graphml", xmlns="http://graphml.graphdrawing.org/xmlns")
-    # Keys (GraphML requires 'for', 'attr.name', 'attr.type')
-    SubElement(
-        gml,
-        "key",
-        id="d0",
-        attrib={"for": "edge", "attr.name": "n_src1", "attr.type": "int"},
-    )
-    SubElement(
-        gml,
-        "key",
-        id="d1",
-        attrib={"for": "edge", "attr.name": "k_counterex", "attr.type": "int"},
-    )
-    SubElement(
-        gml,
-        "key",
-        id="d2",
-        attrib={"for": "edge", "attr.name": "ci95_upper", "attr.type": "double"},
-    )
-    SubElement(
-        gml,
-        "key",
-        id="d3",
-        attrib={"for": "edge", "attr.name": "q_value", "attr.type": "double"},
-    )
+    return "".join(fragment for parts in _graphml_parts(graph) for fragment in parts)
 
-    g = SubElement(gml, "graph", edgedefault="directed")
-    node_ids: List[str] = list(graph.get("nodes", []))
-    for node in node_ids:
-        SubElement(g, "node", id=node)
 
-    for idx, e in enumerate(graph.get("edges", [])):
-        edge_el = SubElement(g, "edge", id=f"e{idx}", source=e["src"], target=e["dst"])
-        SubElement(edge_el, "data", key="d0").text = str(e.get("n_src1", 0))
-        SubElement(edge_el, "data", key="d1").text = str(e.get("k_counterex", 0))
-        SubElement(edge_el, "data", key="d2").text = str(e.get("ci95_upper", 0.0))
-        qv = e.get("q_value")
-        SubElement(edge_el, "data", key="d3").text = "" if qv is None else str(qv)
+def to_graphml(graph: Dict[str, Any]) -> str:
+    """Compatibility wrapper for fast_to_graphml."""
+    return fast_to_graphml(graph)
+
+
+def iter_graphml(graph: Dict[str, Any]) -> Iterator[str]:
+    """Yield the to_graphml document in chunks of GRAPHML_CHUNK_EDGES edges."""
+    for parts in _graphml_parts(graph):
+        yield "".join(parts)
+
+
+def stream_graphml(graph: Dict[str, Any], fp: TextIO) -> None:
+    """Write GraphML for the graph to an open text file, chunk by chunk."""
+    for chunk in iter_graphml(graph):
+        fp.write(chunk)
+
 
-    return tostring(gml, encoding="unicode")
+def nan_to_null(obj: Any) -> Any:
+    """Replace NaN/Infinity with None, as orjson does, so graph.json is valid JSON either way."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: nan_to_null(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [nan_to_null(v) for v in obj]
+    return obj
 
 
 def write_graph_files(graph: Dict[str, Any], out_dir: Path) -> Dict[str, Path]:
     out_dir.mkdir(parents=True, exist_ok=True)
     json_path = out_dir / "graph.json"
     graphml_path = out_dir / "graph.graphml"
-    json_path.write_text(json.dumps(graph, ensure_ascii=False, indent=2), encoding="utf-8")
-    graphml_path.write_text(to_graphml(graph), encoding="utf-8")
+    if ORJSON_AVAILABLE:
+        json_path.write_bytes(
+            orjson.dumps(graph, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        )
+    else:
+        json_path.write_text(
+            json.dumps(nan_to_null(graph), ensure_ascii=False, indent=2, allow_nan=False), encoding="utf-8"
+        )
+    with open(graphml_path, "w", encoding="utf-8", buffering=1 << 20) as fp:
+        stream_graphml(graph, fp)
     return {"json": json_path, "graphml": graphml_path}
 
 
@@ -0,0 +1,10 @@
+"""HTTP caching helpers shared by the dashboard and the graph API."""
+
+from __future__ import annotations
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak If-None-Match comparison: ``W/`` prefixes are ignored and ``*`` matches anything."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
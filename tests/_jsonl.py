@@ -0,0 +1,28 @@
+"""JSON/JSONL fixture writers shared by the report script tests."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(path: str | Path, obj: Any) -> None:
+    Path(path).write_bytes(dumps(obj))
+
+
+def write_jsonl(path: str | Path, rows: Iterable[Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [dumps(r) for r in rows]
+    path.write_bytes(b"\n".join(lines) + b"\n" if lines else b"")
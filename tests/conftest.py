@@ -1,6 +1,7 @@
 import os
 import sys
 import pytest
+from hypothesis import Phase, settings
 
 # Ensure project root is importable so that `src` package can be resolved
 ROOT = os.path.dirname(os.path.dirname(__file__))
@@ -13,11 +14,30 @@ if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
 
-@pytest.fixture(scope="session", autouse=True)
-def _api_key_env_setup():
-    # Provide a default superset of API keys covering all scopes used across tests
-    # Format: scope:key
-    os.environ["BOLCD_API_KEYS"] = ",".join([
+# Under pytest-xdist every worker gets its own SQLite file, so workers that
+# reset the schema or roll back transactions don't step on each other.
+# Set before anything imports bolcd.db, which reads DB_URL at import.
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+if _XDIST_WORKER and "DB_URL" not in os.environ:
+    os.environ["DB_URL"] = f"sqlite:///data/db/bolcd_{_XDIST_WORKER}.db"
+
+# Hypothesis budgets: a small deterministic "ci" run by default, the full search
+# with shrinking under HYPOTHESIS_PROFILE=nightly
+settings.register_profile(
+    "ci",
+    max_examples=20,
+    derandomize=True,
+    database=None,
+    deadline=None,
+    phases=[Phase.explicit, Phase.reuse, Phase.generate],
+)
+settings.register_profile("nightly", max_examples=200, deadline=None)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
+
+# Default superset of API keys covering all scopes used across tests
+# Format: scope:key
+_TEST_ENV = {
+    "BOLCD_API_KEYS": ",".join([
         # Keys used by integration tests
         "admin:admin-key",
         "condensed:test-key",
@@ -31,8 +51,44 @@ def _api_key_env_setup():
         # Additional roles used in some RBAC tests
         "viewer:testviewer",
         "operator:testop",
-    ])
+    ]),
     # Ensure tests use plain key matching and avoid rate limiting side-effects
-    os.environ["BOLCD_HASH_METHOD"] = "plain"
-    os.environ["BOLCD_RATE_LIMIT_ENABLED"] = "0"
+    "BOLCD_HASH_METHOD": "plain",
+    "BOLCD_RATE_LIMIT_ENABLED": "0",
+}
+# Applied at import so test modules that import the app at collection time see it
+os.environ.update(_TEST_ENV)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _api_key_env_setup():
+    # Re-apply in case a test module overrode the keys while being collected
+    os.environ.update(_TEST_ENV)
     yield
+
+
+@pytest.fixture(scope="session")
+def app_mod():
+    """The API app module, imported once per session"""
+    import bolcd.api.app as m
+    return m
+
+
+@pytest.fixture(scope="session")
+def sigma_sample(tmp_path_factory):
+    """A minimal Sigma rule, written and parsed once per session"""
+    from bolcd.connectors.sigma import load_sigma_yaml, parse_sigma_to_events
+
+    y = tmp_path_factory.mktemp("sigma") / "r.yml"
+    y.write_text(
+        """
+title: Example
+detection:
+  sel:
+    ps_exec_count: 1
+  condition: sel
+timeframe: 5m
+        """,
+        encoding="utf-8",
+    )
+    return parse_sigma_to_events(load_sigma_yaml(str(y)))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import json
 import pytest
 import os
 from fastapi.testclient import TestClient
 
-from bolcd.api.app import app
+from bolcd.api.app import _graph_ndjson, app
 
 
 @pytest.fixture(scope="module")
@@ -45,6 +46,38 @@ def test_recompute_and_graph(client: TestClient, tmp_path):
     # graphml
     r2 = client.get("/api/graph", params={"format": "graphml"})
     assert r2.status_code == 200 and "<graphml" in r2.text
+    # unchanged graph revalidates to 304
+    etag = client.get("/api/graph").headers["etag"]
+    r304 = client.get("/api/graph", headers={"If-None-Match": etag})
+    assert r304.status_code == 304 and r304.content == b""
+    for validator in (f'"other", W/{etag}', "*"):
+        assert client.get("/api/graph", headers={"If-None-Match": validator}).status_code == 304
+    # ndjson stream carries the same nodes and edges
+    r3 = client.get("/api/graph/stream")
+    assert r3.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r3.text.splitlines()]
+    assert [r["id"] for r in records if r["type"] == "node"] == g["nodes"]
+    assert [{k: v for k, v in r.items() if k != "type"} for r in records if r["type"] == "edge"] == g["edges"]
+
+    # noisy X -> Y still passes BH, and its edge carries ci95_upper = NaN
+    noisy = [{"X": 1.0, "Y": float(i % 200 != 0)} for i in range(1000)]
+    noisy += [{"X": 0.0, "Y": float(i % 2)} for i in range(1000)]
+    sample.write_text("".join(json.dumps(ev) + "\n" for ev in noisy), encoding="utf-8")
+    r = client.post(
+        "/api/edges/recompute",
+        headers={"X-API-Key": "testop"},
+        json={"events_path": str(sample), "epsilon": 0.02, "fdr_q": 0.01, "persist_dir": str(tmp_path)},
+    )
+    assert r.status_code == 200
+    r4 = client.get("/api/graph")
+    assert r4.status_code == 200
+    noisy_edges = [e for e in json.loads(r4.text, parse_constant=pytest.fail)["edges"] if e["k_counterex"] > 0]
+    assert noisy_edges and all(e["ci95_upper"] is None for e in noisy_edges)
+    r5 = client.get("/api/graph/stream")
+    streamed = [json.loads(line, parse_constant=pytest.fail) for line in r5.text.splitlines()]
+    assert [r for r in streamed if r["type"] == "edge" and r["k_counterex"] > 0] == [
+        {**e, "type": "edge"} for e in noisy_edges
+    ]
 
 
 def test_writeback_rbac(client: TestClient):
@@ -62,3 +95,35 @@ def test_writeback_rbac(client: TestClient):
         json={"target": "splunk", "rules": [{"name": "r1", "spl": "index=main | head 1"}]},
     )
     assert r2.status_code == 200 and r2.json()["status"] in ("dry-run", "ok")
+
+
+def test_dashboard_served_precompressed(client: TestClient):
+    r = client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200 and r.headers["content-encoding"] == "gzip"
+    assert "BOL" in r.text
+    r2 = client.get("/dashboard", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in r2.headers and r2.text == r.text
+
+
+def test_dashboard_prefers_brotli(client: TestClient):
+    pytest.importorskip("brotli")
+    r = client.get("/dashboard", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["content-encoding"] == "br" and "BOL" in r.text
+    r2 = client.get("/dashboard", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert r2.headers["content-encoding"] == "gzip"
+
+
+def test_dashboard_revalidates_with_etag(client: TestClient):
+    r = client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+    etag = r.headers["etag"]
+    assert "must-revalidate" in r.headers["cache-control"]
+    r2 = client.get("/dashboard", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert r2.status_code == 304 and r2.content == b""
+    r3 = client.get("/dashboard", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert r3.status_code == 200 and r3.headers["etag"] != etag
+
+
+def test_graph_ndjson_edge_type_is_not_overridden():
+    g = {"nodes": ["A"], "edges": [{"src": "A", "dst": "B", "type": "implies"}]}
+    records = [json.loads(line) for chunk in _graph_ndjson(g) for line in chunk.splitlines()]
+    assert [r["type"] for r in records] == ["node", "edge"]
@@ -0,0 +1,18 @@
+import asyncio
+import sys
+
+import pytest
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run the async integration tests on uvloop when it is installed"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
@@ -5,44 +5,87 @@ import pytest
 import pytest_asyncio
 import asyncio
 import httpx
+from prometheus_client import REGISTRY
 from datetime import datetime, timedelta
 import os
 from typing import Any  # noqa: F401
 
-# Run all tests in this module with pytest-asyncio
-pytestmark = pytest.mark.asyncio
+# Run all tests in this module with pytest-asyncio, on one session-wide loop
+# so the shared client fixture can be reused across tests
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
-# Ensure API keys are configured before importing the app (keys are read at import)
-os.environ["BOLCD_API_KEYS"] = "admin:admin-key,condensed:test-key,full:full-key,ingest:ingest-key"
-os.environ["BOLCD_HASH_METHOD"] = "plain"
-os.environ["BOLCD_RATE_LIMIT_ENABLED"] = "0"
+# API keys, hash method and rate limiting are configured by tests/conftest.py
+# before this module (and the app it imports) is loaded
 
 # Test configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://test")
 API_KEY_ADMIN = os.getenv("TEST_API_KEY_ADMIN", "admin-key")
 API_KEY_CONSUMER = os.getenv("TEST_API_KEY_CONSUMER", "test-key")
+# Normalized once and shared by every request; tests must not mutate them
+HDR_ADMIN = httpx.Headers({"X-API-Key": API_KEY_ADMIN})
+HDR_CONSUMER = httpx.Headers({"X-API-Key": API_KEY_CONSUMER})
 
 
 from src.bolcd.api.main import app  # noqa: E402
 
 
-@pytest_asyncio.fixture
-async def client():
-    """Create an async HTTP client against the in-memory ASGI app."""
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create a fresh schema once for the whole session"""
+    from src.bolcd.db import engine
+    from src.bolcd.models.condense import Base
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(db_engine):
+    """One async HTTP client against the in-memory ASGI app, reused by every test.
+
+    ASGITransport sends plain http scopes and never drives the app lifespan, so
+    the schema the lifespan's init_db() would create comes from db_engine once.
+    """
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url=API_BASE_URL) as client:
         yield client
 
 
-@pytest_asyncio.fixture
-async def cleanup_db():
-    """Clean up test data after each test"""
-    # Reset DB tables before each test for isolation
-    from src.bolcd.db import engine
-    from src.bolcd.models.condense import Base
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
+@pytest.fixture
+def cleanup_db(db_engine):
+    """Run the test inside one outer transaction that is rolled back afterwards"""
+    from sqlalchemy.orm import Session
+    from src.bolcd.db import get_db
+
+    conn = db_engine.connect()
+    trans = conn.begin()
+    if conn.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first DML, so the first SAVEPOINT
+        # would open (and its RELEASE commit) a transaction of its own
+        conn.exec_driver_sql("BEGIN")
+    # Savepoints on one connection must nest, so requests take turns with it
+    conn_lock = asyncio.Lock()
+
+    # Request sessions join the outer transaction and their commits become
+    # savepoints; async so they are opened and closed on the loop thread
+    async def _test_db():
+        async with conn_lock:
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            try:
+                yield db
+            finally:
+                db.close()
+
+    app.dependency_overrides[get_db] = _test_db
     yield
+    app.dependency_overrides.pop(get_db, None)
+    trans.rollback()
+    conn.close()
+
+
+async def get_alerts(client: httpx.AsyncClient, view: str, headers: httpx.Headers) -> httpx.Response:
+    """List alerts in the given view with the given API key headers"""
+    return await client.get(f"/v1/alerts?view={view}", headers=headers)
 
 
 class TestE2EFlow:
@@ -85,7 +128,7 @@ class TestE2EFlow:
             response = await client.post(
                 "/v1/ingest",
                 json=alert,
-                headers={"X-API-Key": API_KEY_ADMIN}
+                headers=HDR_ADMIN
             )
             assert response.status_code == 200
             result = response.json()
@@ -93,10 +136,7 @@ class TestE2EFlow:
             print(f"Ingested alert {result['alert_id']}: decision={result['decision']}")
         
         # Step 2: Check condensed view
-        response = await client.get(
-            "/v1/alerts?view=condensed",
-            headers={"X-API-Key": API_KEY_CONSUMER}
-        )
+        response = await get_alerts(client, "condensed", HDR_CONSUMER)
         assert response.status_code == 200
         condensed = response.json()
         assert "alerts" in condensed
@@ -110,10 +150,7 @@ class TestE2EFlow:
         assert critical_found, "Critical alert should be in condensed view"
         
         # Step 3: Check full view (admin only)
-        response = await client.get(
-            "/v1/alerts?view=full",
-            headers={"X-API-Key": API_KEY_ADMIN}
-        )
+        response = await get_alerts(client, "full", HDR_ADMIN)
         assert response.status_code == 200
         full = response.json()
         assert len(full["alerts"]) == len(alerts)
@@ -123,7 +160,7 @@ class TestE2EFlow:
         if ingested_ids:
             response = await client.get(
                 f"/v1/alerts/{ingested_ids[0]}/explain",
-                headers={"X-API-Key": API_KEY_CONSUMER}
+                headers=HDR_CONSUMER
             )
             assert response.status_code == 200
             explanation = response.json()
@@ -134,7 +171,7 @@ class TestE2EFlow:
         # Step 5: Check late replay (may be empty initially)
         response = await client.get(
             "/v1/alerts/late",
-            headers={"X-API-Key": API_KEY_CONSUMER}
+            headers=HDR_CONSUMER
         )
         assert response.status_code == 200
         late = response.json()
@@ -145,64 +182,44 @@ class TestE2EFlow:
         """Test that high/critical severity alerts are never suppressed"""
         
         severities = ["low", "medium", "high", "critical"]
-        results = {}
-        
-        for severity in severities:
-            alert = {
-                "ts": datetime.now().isoformat(),
+        ts = datetime.now().isoformat()
+        alerts = [
+            (severity, {
+                "ts": ts,
                 "entity_id": f"host-{severity}",
                 "rule_id": f"R-{severity}",
                 "severity": severity,
                 "signature": f"test_{severity}",
                 "attrs": {"test": True}
-            }
-            
-            response = await client.post(
-                "/v1/ingest",
-                json=alert,
-                headers={"X-API-Key": API_KEY_ADMIN}
-            )
-            assert response.status_code == 200
-            result = response.json()
-            results[severity] = result["decision"]
+            })
+            for severity in severities
+        ]
+        
+        # Decisions don't depend on order, so send all four at once
+        responses = await asyncio.gather(*[
+            client.post("/v1/ingest", json=alert, headers=HDR_ADMIN)
+            for _, alert in alerts
+        ])
+        assert all(r.status_code == 200 for r in responses)
+        results = {severity: r.json()["decision"] for (severity, _), r in zip(alerts, responses)}
         
         # High and critical should always be delivered
         assert results["high"] == "deliver", "High severity should be delivered"
         assert results["critical"] == "deliver", "Critical severity should be delivered"
         print(f"Severity protection test results: {results}")
     
-    async def test_api_key_scopes(self, client: httpx.AsyncClient):
+    @pytest.mark.parametrize("view,headers,expected", [
+        ("condensed", HDR_CONSUMER, 200),  # consumer key can read the condensed view
+        ("full", HDR_CONSUMER, 403),       # ...but not the full view
+        ("full", HDR_ADMIN, 200),          # admin key can read everything
+        ("condensed", httpx.Headers({"X-API-Key": "invalid-key"}), 401),
+    ])
+    async def test_api_key_scopes(
+        self, client: httpx.AsyncClient, view: str, headers: httpx.Headers, expected: int
+    ):
         """Test API key scope enforcement"""
-        
-        # Test consumer key - should access condensed view
-        response = await client.get(
-            "/v1/alerts?view=condensed",
-            headers={"X-API-Key": API_KEY_CONSUMER}
-        )
-        assert response.status_code == 200
-        
-        # Test consumer key - should NOT access full view
-        response = await client.get(
-            "/v1/alerts?view=full",
-            headers={"X-API-Key": API_KEY_CONSUMER}
-        )
-        assert response.status_code == 403
-        
-        # Test admin key - should access everything
-        response = await client.get(
-            "/v1/alerts?view=full",
-            headers={"X-API-Key": API_KEY_ADMIN}
-        )
-        assert response.status_code == 200
-        
-        # Test invalid key
-        response = await client.get(
-            "/v1/alerts?view=condensed",
-            headers={"X-API-Key": "invalid-key"}
-        )
-        assert response.status_code == 401
-        
-        print("API key scope tests passed")
+        response = await get_alerts(client, view, headers)
+        assert response.status_code == expected
     
     @pytest.mark.usefixtures("cleanup_db")
     async def test_near_window_suppression(self, client: httpx.AsyncClient):
@@ -234,7 +251,7 @@ class TestE2EFlow:
         response1 = await client.post(
             "/v1/ingest",
             json=alert1,
-            headers={"X-API-Key": API_KEY_ADMIN}
+            headers=HDR_ADMIN
         )
         assert response1.status_code == 200
         result1 = response1.json()
@@ -242,7 +259,7 @@ class TestE2EFlow:
         response2 = await client.post(
             "/v1/ingest",
             json=alert2,
-            headers={"X-API-Key": API_KEY_ADMIN}
+            headers=HDR_ADMIN
         )
         assert response2.status_code == 200
         result2 = response2.json()
@@ -250,10 +267,7 @@ class TestE2EFlow:
         print(f"Alert 1: {result1['decision']}, Alert 2: {result2['decision']}")
         
         # Check condensed view
-        response = await client.get(
-            "/v1/alerts?view=condensed",
-            headers={"X-API-Key": API_KEY_CONSUMER}
-        )
+        response = await get_alerts(client, "condensed", HDR_CONSUMER)
         assert response.status_code == 200
         condensed = response.json()
         
@@ -264,93 +278,110 @@ class TestE2EFlow:
         ]
         print(f"Condensed alerts for host-corr: {len(entity_alerts)}")
     
-    @pytest.mark.usefixtures("cleanup_db")
-    async def test_performance_under_load(self, client: httpx.AsyncClient):
-        """Test system performance under load"""
-        
-        num_alerts = 100
-        batch_size = 10  # Limit concurrent requests to avoid connection pool exhaustion
+    async def _ingest_concurrently(self, client: httpx.AsyncClient, num_alerts: int) -> float:
+        """Ingest num_alerts alerts through one gather and return the wall time in seconds"""
+        # The ASGI transport is in-process, so there is no TCP pool to exhaust;
+        # the semaphore only bounds how many requests are in flight at once
+        sem = asyncio.Semaphore(50)
+        # Shared per-request inputs, built once rather than per alert; with one
+        # timestamp the derived entity:rule:ts ids would collide, so ids are explicit
+        ts = datetime.now().isoformat()
+        sevs = ("low", "medium", "high")
+        decisions_before = REGISTRY.get_sample_value("bolcd_decision_latency_seconds_count") or 0.0
         start_time = datetime.now()
         
         # Generate and send alerts concurrently
         async def send_alert(i: int):
             alert = {
-                "ts": datetime.now().isoformat(),
+                "id": f"load-{i}",
+                "ts": ts,
                 "entity_id": f"host-{i % 10}",
                 "rule_id": f"R-{i % 50}",
-                "severity": ["low", "medium", "high"][i % 3],
+                "severity": sevs[i % 3],
                 "signature": f"event_{i % 20}",
                 "attrs": {"index": i}
             }
             
-            response = await client.post(
-                "/v1/ingest",
-                json=alert,
-                headers={"X-API-Key": API_KEY_ADMIN}
-            )
+            async with sem:
+                response = await client.post(
+                    "/v1/ingest",
+                    json=alert,
+                    headers=HDR_ADMIN
+                )
             return response.status_code == 200
         
-        # Send alerts in batches to avoid connection pool exhaustion
-        results = []
-        for batch_start in range(0, num_alerts, batch_size):
-            batch_end = min(batch_start + batch_size, num_alerts)
-            batch_tasks = [send_alert(i) for i in range(batch_start, batch_end)]
-            batch_results = await asyncio.gather(*batch_tasks)
-            results.extend(batch_results)
+        results = await asyncio.gather(*[send_alert(i) for i in range(num_alerts)])
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         
         assert all(results), "Some alerts failed to ingest"
+        
+        # Metric exposition is covered by test_metrics_endpoint; here just check
+        # the collector saw every decision, without scraping /metrics again
+        decisions = REGISTRY.get_sample_value("bolcd_decision_latency_seconds_count")
+        assert decisions - decisions_before >= num_alerts
+        return duration
+    
+    @pytest.mark.usefixtures("cleanup_db")
+    async def test_performance_under_load(self, client: httpx.AsyncClient):
+        """Test system performance under load"""
+        
+        num_alerts = 100
+        duration = await self._ingest_concurrently(client, num_alerts)
+        # Loose bound: the default run may share the machine with other workers;
+        # the tight floor is test_ingest_latency_floor under the perf marker
         assert duration < 10, f"Ingesting {num_alerts} alerts took too long: {duration}s"
         
         print(f"Performance test: {num_alerts} alerts in {duration:.2f}s")
         print(f"Throughput: {num_alerts/duration:.2f} alerts/sec")
+    
+    @pytest.mark.perf
+    @pytest.mark.usefixtures("cleanup_db")
+    async def test_ingest_latency_floor(self, client: httpx.AsyncClient):
+        """100 concurrent ingests finish within 3s on an otherwise idle runner"""
         
-        # Check metrics endpoint
-        response = await client.get("/metrics")
-        assert response.status_code == 200
-        metrics = response.text
-        assert "bolcd_suppress_total" in metrics
-        assert "bolcd_decision_latency_seconds" in metrics
+        num_alerts = 100
+        duration = await self._ingest_concurrently(client, num_alerts)
+        assert duration < 3, f"Ingesting {num_alerts} alerts took too long: {duration}s"
 
 
-@pytest.mark.asyncio
-async def test_health_check():
-    """Test health check endpoint"""
+async def _standalone(check):
     transport = httpx.ASGITransport(app=app)
     async with httpx.AsyncClient(transport=transport, base_url=API_BASE_URL) as client:
-        response = await client.get("/health")
-        assert response.status_code == 200
-        health = response.json()
-        assert health["status"] == "healthy"
-        print(f"Health check: {health}")
+        await check(client)
+
+
+async def test_health_check(client: httpx.AsyncClient):
+    """Test health check endpoint"""
+    response = await client.get("/health")
+    assert response.status_code == 200
+    health = response.json()
+    assert health["status"] == "healthy"
+    print(f"Health check: {health}")
 
 
-@pytest.mark.asyncio
-async def test_metrics_endpoint():
+async def test_metrics_endpoint(client: httpx.AsyncClient):
     """Test Prometheus metrics endpoint"""
-    transport = httpx.ASGITransport(app=app)
-    async with httpx.AsyncClient(transport=transport, base_url=API_BASE_URL) as client:
-        response = await client.get("/metrics")
-        assert response.status_code == 200
-        assert "text/plain" in response.headers["content-type"]
-        
-        metrics = response.text
-        expected_metrics = [
-            "bolcd_suppress_total",
-            "bolcd_late_replay_total",
-            "bolcd_false_suppression_total",
-            "bolcd_decision_latency_seconds"
-        ]
-        
-        for metric in expected_metrics:
-            assert metric in metrics, f"Metric {metric} not found"
-        
-        print("All expected metrics found")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert "text/plain" in response.headers["content-type"]
+    
+    metrics = response.text
+    expected_metrics = [
+        "bolcd_suppress_total",
+        "bolcd_late_replay_total",
+        "bolcd_false_suppression_total",
+        "bolcd_decision_latency_seconds"
+    ]
+    
+    for metric in expected_metrics:
+        assert metric in metrics, f"Metric {metric} not found"
+    
+    print("All expected metrics found")
 
 
 if __name__ == "__main__":
     # Run tests
-    asyncio.run(test_health_check())
-    asyncio.run(test_metrics_endpoint())
+    asyncio.run(_standalone(test_health_check))
+    asyncio.run(_standalone(test_metrics_endpoint))
@@ -1,18 +1,9 @@
 import json
 import pathlib
-import subprocess
-import sys
 import datetime
 
-
-def write_json(p, obj):
-    pathlib.Path(p).write_text(json.dumps(obj), encoding='utf-8')
-
-
-def write_jsonl(p, rows):
-    with open(p, 'w', encoding='utf-8') as f:
-        for r in rows:
-            f.write(json.dumps(r) + '\n')
+from scripts.kpi.compute_kpi import main as kpi_main
+from tests._jsonl import write_json, write_jsonl
 
 
 def test_kpi_e2e(tmp_path: pathlib.Path):
@@ -31,23 +22,21 @@ def test_kpi_e2e(tmp_path: pathlib.Path):
     
     # cases (simple)
     base = datetime.datetime(2099, 1, 1, 0, 0, 0)
-    rows = []
-    for i in range(50):
-        det = base + datetime.timedelta(minutes=i)
-        tri = det + datetime.timedelta(minutes=5)
-        res = tri + datetime.timedelta(minutes=10)
-        rows.append({
+    minute = datetime.timedelta(minutes=1)
+    rows = [
+        {
             "case_id": f"C{i}",
-            "detected_at": det.isoformat(),
-            "triaged_at": tri.isoformat(),
-            "resolved_at": res.isoformat(),
+            "detected_at": (base + i * minute).isoformat(),
+            "triaged_at": (base + (i + 5) * minute).isoformat(),
+            "resolved_at": (base + (i + 15) * minute).isoformat(),
             "status": "closed"
-        })
+        }
+        for i in range(50)
+    ]
     write_jsonl(tmp_path / 'cases.jsonl', rows)
 
     # KPI computation
-    subprocess.check_call([
-        sys.executable, 'scripts/kpi/compute_kpi.py',
+    kpi_main([
         '--date', today,
         '--reports-dir', str(reports),
         '--cases', str(tmp_path / 'cases.jsonl'),
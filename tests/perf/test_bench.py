@@ -2,10 +2,20 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from bolcd.cli.bench import BenchParams, benchmark
 
 
 def test_micro_bench_runs(tmp_path: Path):
+    params = BenchParams(d=10, n=500, runs=1, fdr_q=0.01, epsilon=0.02, delta=0.0)
+    res = benchmark(params)
+    assert res["eps_mean"] > 0
+    assert res["latency_ms_p95"] >= 0
+
+
+@pytest.mark.perf
+def test_bench_throughput_floor(tmp_path: Path):
     params = BenchParams(d=50, n=20000, runs=2, fdr_q=0.01, epsilon=0.02, delta=0.0)
     res = benchmark(params)
     assert res["eps_mean"] > 5000
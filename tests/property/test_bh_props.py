@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from hypothesis import given, settings
+from hypothesis import given
 from hypothesis import strategies as st
 
 from bolcd.core import bh_qvalues
 
 
-@settings(max_examples=50, deadline=None)
 @given(st.lists(st.floats(min_value=0.0, max_value=1.0), min_size=3, max_size=50))
 def test_bh_non_decreasing_on_sorted_p(pvals):
     p = sorted(pvals)
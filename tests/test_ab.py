@@ -1,17 +1,11 @@
 from __future__ import annotations
 
 import json
-import subprocess
-import sys
 from datetime import date
 from pathlib import Path
 
-
-def write_jsonl(path: Path, rows: list[dict]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+from scripts import ab_report, ab_weekly
+from tests._jsonl import write_jsonl
 
 
 def test_ab_report_effects_fields(tmp_path: Path) -> None:
@@ -31,24 +25,23 @@ def test_ab_report_effects_fields(tmp_path: Path) -> None:
     write_jsonl(a_path, a_rows)
     write_jsonl(b_path, b_rows)
 
-    cmd = [
-        sys.executable,
-        str(Path(__file__).resolve().parents[1] / "scripts" / "ab_report.py"),
-        "--a",
-        str(a_path),
-        "--b",
-        str(b_path),
-        "--out-prefix",
-        str(out_prefix),
-        "--keys",
-        "host",
-        "index",
-        "sourcetype",
-        "source",
-        "component",
-        "group",
-    ]
-    subprocess.run(cmd, check=True)
+    ab_report.main(
+        [
+            "--a",
+            str(a_path),
+            "--b",
+            str(b_path),
+            "--out-prefix",
+            str(out_prefix),
+            "--keys",
+            "host",
+            "index",
+            "sourcetype",
+            "source",
+            "component",
+            "group",
+        ]
+    )
 
     data = json.loads((out_prefix.with_suffix(".json")).read_text(encoding="utf-8"))
     eff = data["effects"]
@@ -69,21 +62,20 @@ def test_ab_weekly_md_rows_and_no_data(tmp_path: Path) -> None:
 
     out_prefix = tmp_path / "reports" / f"ab_weekly_{today}"
 
-    cmd = [
-        sys.executable,
-        str(Path(__file__).resolve().parents[1] / "scripts" / "ab_weekly.py"),
-        "--prefix-a",
-        str(data_raw / "splunk_A_"),
-        "--prefix-b",
-        str(data_raw / "splunk_B_"),
-        "--start",
-        today,
-        "--end",
-        today,
-        "--out-prefix",
-        str(out_prefix),
-    ]
-    subprocess.run(cmd, check=True)
+    ab_weekly.main(
+        [
+            "--prefix-a",
+            str(data_raw / "splunk_A_"),
+            "--prefix-b",
+            str(data_raw / "splunk_B_"),
+            "--start",
+            today,
+            "--end",
+            today,
+            "--out-prefix",
+            str(out_prefix),
+        ]
+    )
 
     md = (out_prefix.with_suffix(".md")).read_text(encoding="utf-8")
     assert today in md
@@ -91,21 +83,20 @@ def test_ab_weekly_md_rows_and_no_data(tmp_path: Path) -> None:
 
     # No-data range
     nodata_prefix = tmp_path / "reports" / "ab_weekly_nodata"
-    cmd2 = [
-        sys.executable,
-        str(Path(__file__).resolve().parents[1] / "scripts" / "ab_weekly.py"),
-        "--prefix-a",
-        str(data_raw / "splunk_A_"),
-        "--prefix-b",
-        str(data_raw / "splunk_B_"),
-        "--start",
-        "1999-01-01",
-        "--end",
-        "1999-01-01",
-        "--out-prefix",
-        str(nodata_prefix),
-    ]
-    subprocess.run(cmd2, check=True)
+    ab_weekly.main(
+        [
+            "--prefix-a",
+            str(data_raw / "splunk_A_"),
+            "--prefix-b",
+            str(data_raw / "splunk_B_"),
+            "--start",
+            "1999-01-01",
+            "--end",
+            "1999-01-01",
+            "--out-prefix",
+            str(nodata_prefix),
+        ]
+    )
     md2 = (nodata_prefix.with_suffix(".md")).read_text(encoding="utf-8")
     assert "> No data" in md2
 
@@ -1,10 +1,27 @@
 from pathlib import Path
 import json
-import importlib
+
+import pytest
 
 from prometheus_client import CONTENT_TYPE_LATEST  # noqa: F401 (import ensures client available)
 
 
+@pytest.fixture
+def ab_metrics(app_mod, monkeypatch, tmp_path: Path):
+    """Zero the AB gauges and point the app at a temp reports dir"""
+    for g in (
+        app_mod.AB_REDUCTION_COUNT,
+        app_mod.AB_REDUCTION_UNIQUE,
+        app_mod.AB_SUPPRESSED_COUNT,
+        app_mod.AB_NEW_IN_B_UNIQUE,
+        app_mod.AB_NEW_IN_B_COUNT,
+        app_mod.AB_LAST_FILE_MTIME,
+    ):
+        g.set(0)
+    monkeypatch.setattr(app_mod, "BOLCD_REPORTS_DIR", tmp_path)
+    return app_mod
+
+
 def read_metric_value(text: str, name: str) -> float:
     for line in text.splitlines():
         if line.startswith(name + " "):
@@ -12,51 +29,54 @@ def read_metric_value(text: str, name: str) -> float:
     raise AssertionError(f"metric {name} not found in exposition")
 
 
-def test_update_metrics_from_effects_only_json(tmp_path: Path):
-    # Lazy import to access module-level globals
-    app_mod = importlib.import_module("bolcd.api.app")
-    # Point to temp reports dir
-    app_mod.BOLCD_REPORTS_DIR = tmp_path
-
-    # Write effects-only JSON (as produced by tee)
-    effects = {
-        "reduction_by_count": 0.2,
-        "reduction_by_unique": 0.15,
-        "suppressed_count": 123,
-        "new_in_b_unique": 2,
-        "new_in_b_count": 5,
-    }
-    p = tmp_path / "ab_2025-08-11_effects.json"
-    p.write_text(json.dumps(effects), encoding="utf-8")
-
-    # Update metrics and export
-    app_mod._update_ab_metrics_from_reports()
+@pytest.mark.parametrize(
+    "effects, new_in_b_top, expected",
+    [
+        # effects-only JSON (as produced by tee)
+        (
+            {
+                "reduction_by_count": 0.2,
+                "reduction_by_unique": 0.15,
+                "suppressed_count": 123,
+                "new_in_b_unique": 2,
+                "new_in_b_count": 5,
+            },
+            None,
+            (0.2, 0.15, 123.0, 2.0, 5.0),
+        ),
+        # new_in_b_* omitted: fall back to unique and total from top.new_in_b
+        (
+            {"reduction_by_count": 0.3, "reduction_by_unique": 0.25, "suppressed_count": 200},
+            [{"signature": "X", "count": 4}, {"signature": "Y", "count": 6}],
+            (0.3, 0.25, 200.0, 2.0, 10.0),
+        ),
+    ],
+)
+def test_apply_ab_effects(ab_metrics, effects, new_in_b_top, expected):
+    app_mod = ab_metrics
+    app_mod._apply_ab_effects(effects, new_in_b_top)
     text = app_mod.generate_latest(app_mod.REGISTRY).decode("utf-8")
 
-    assert read_metric_value(text, "bolcd_ab_reduction_by_count") == 0.2
-    assert read_metric_value(text, "bolcd_ab_reduction_by_unique") == 0.15
-    assert read_metric_value(text, "bolcd_ab_suppressed_count") == 123.0
-    assert read_metric_value(text, "bolcd_ab_new_in_b_unique") == 2.0
-    assert read_metric_value(text, "bolcd_ab_new_in_b_count") == 5.0
+    names = (
+        "bolcd_ab_reduction_by_count",
+        "bolcd_ab_reduction_by_unique",
+        "bolcd_ab_suppressed_count",
+        "bolcd_ab_new_in_b_unique",
+        "bolcd_ab_new_in_b_count",
+    )
+    assert tuple(read_metric_value(text, n) for n in names) == expected
 
 
-def test_update_metrics_from_full_report_json(tmp_path: Path):
-    app_mod = importlib.import_module("bolcd.api.app")
-    app_mod.BOLCD_REPORTS_DIR = tmp_path
+def test_update_metrics_from_full_report_json(tmp_path: Path, ab_metrics):
+    app_mod = ab_metrics
 
     data = {
         "effects": {
             "reduction_by_count": 0.3,
             "reduction_by_unique": 0.25,
             "suppressed_count": 200,
-            # omit new_in_b_* to force fallback from top.new_in_b
-        },
-        "top": {
-            "new_in_b": [
-                {"signature": "X", "count": 4},
-                {"signature": "Y", "count": 6},
-            ]
         },
+        "top": {"new_in_b": [{"signature": "X", "count": 4}]},
     }
     p = tmp_path / "ab_2025-08-12.json"
     p.write_text(json.dumps(data), encoding="utf-8")
@@ -65,10 +85,5 @@ def test_update_metrics_from_full_report_json(tmp_path: Path):
     text = app_mod.generate_latest(app_mod.REGISTRY).decode("utf-8")
 
     assert read_metric_value(text, "bolcd_ab_reduction_by_count") == 0.3
-    assert read_metric_value(text, "bolcd_ab_reduction_by_unique") == 0.25
-    assert read_metric_value(text, "bolcd_ab_suppressed_count") == 200.0
-    # Fallback path counts unique and total from top.new_in_b
-    assert read_metric_value(text, "bolcd_ab_new_in_b_unique") == 2.0
-    assert read_metric_value(text, "bolcd_ab_new_in_b_count") == 10.0
-
-
+    assert read_metric_value(text, "bolcd_ab_new_in_b_count") == 4.0
+    assert read_metric_value(text, "bolcd_ab_last_file_mtime") == p.stat().st_mtime
@@ -6,7 +6,8 @@ import pytest
 from datetime import datetime, timedelta
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 # Configure API keys before importing the app (use same keys as integration tests)
 os.environ["BOLCD_API_KEYS"] = "admin:admin-key,condensed:test-key,full:full-key,ingest:ingest-key"
@@ -17,51 +18,92 @@ os.environ["BOLCD_HASH_METHOD"] = "plain"  # Use plain keys for testing
 from src.bolcd.models.condense import Base
 from src.bolcd.db import get_db
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+# Test database: in-memory, on one shared connection so it survives across sessions
+SQLALCHEMY_DATABASE_URL = "sqlite://"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
 
 # Now import app after environment is set
 from src.bolcd.api.main import app  # noqa: E402
 
-# Create test client at module scope
-client = TestClient(app)
-
-# Ensure DB override is applied per-test and then cleared to avoid leaking across modules
-@pytest.fixture(autouse=True)
-def _override_dep_per_test():
-    app.dependency_overrides[get_db] = override_get_db
-    yield
-    app.dependency_overrides.clear()
+@pytest.fixture(scope="module")
+def client():
+    """One test client for the module; the app lifespan runs once around it"""
+    with TestClient(app) as c:
+        yield c
 
 # Test API key
 TEST_API_KEY = "admin-key"
+AUTH_HEADERS = {"X-API-Key": TEST_API_KEY}
+
+# Fixed alert timestamps; no decision in these tests depends on the wall clock
+NOW = datetime(2025, 1, 1, 0, 0, 0)
+NOW_ISO = NOW.isoformat()
+NOW_PLUS_1M_ISO = (NOW + timedelta(minutes=1)).isoformat()
+NOW_PLUS_2M_ISO = (NOW + timedelta(minutes=2)).isoformat()
+NOW_PLUS_5M_ISO = (NOW + timedelta(minutes=5)).isoformat()
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module")
 def setup_database():
-    """Setup test database"""
+    """Create the schema once for the module"""
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
 
-def test_health_check():
+@pytest.fixture
+def db_session(setup_database):
+    """Run each test in one outer transaction that is rolled back afterwards
+
+    Request sessions join it and their commits become savepoints. The DB
+    override is cleared again so it doesn't leak across modules.
+    """
+    connection = engine.connect()
+    trans = connection.begin()
+    # pysqlite defers BEGIN until the first DML, so the first SAVEPOINT
+    # would open (and its RELEASE commit) a transaction of its own
+    connection.exec_driver_sql("BEGIN")
+
+    def override_get_db():
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+    app.dependency_overrides.clear()
+    trans.rollback()
+    connection.close()
+
+class _NoDB:
+    def __getattr__(self, name):
+        raise AssertionError(f"test declared no DB but used Session.{name}")
+
+@pytest.fixture
+def no_db():
+    """Serve requests with a session stand-in that fails on any use"""
+    def forbid_db():
+        yield _NoDB()
+
+    app.dependency_overrides[get_db] = forbid_db
+    yield
+    app.dependency_overrides.clear()
+
+def test_health_check(client):
     """Test health check endpoint"""
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
-def test_ingest_alert():
+@pytest.mark.usefixtures("db_session")
+def test_ingest_alert(client):
     """Test alert ingestion"""
     alert_data = {
-        "ts": datetime.utcnow().isoformat(),
+        "ts": NOW_ISO,
         "entity_id": "test-host",
         "rule_id": "TEST-001",
         "severity": "medium",
@@ -71,7 +113,7 @@ def test_ingest_alert():
     response = client.post(
         "/v1/ingest",
         json=alert_data,
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -80,47 +122,44 @@ def test_ingest_alert():
     assert data["alert_id"] is not None
     assert data["decision"] in ["deliver", "suppress"]
 
-def test_list_alerts_condensed():
+@pytest.mark.usefixtures("db_session")
+def test_list_alerts_condensed(client):
     """Test listing condensed alerts"""
     # First ingest some alerts
-    now = datetime.utcnow()
-    
     # Alert 1 - will be delivered
     alert1 = {
         "id": "test-1",
-        "ts": now.isoformat(),
+        "ts": NOW_ISO,
         "entity_id": "host-1",
         "rule_id": "R-001",
         "severity": "high"
     }
     
-    response = client.post(
-        "/v1/ingest",
-        json=alert1,
-        headers={"X-API-Key": TEST_API_KEY}
-    )
-    assert response.status_code == 200
-    
     # Alert 2 - will be suppressed (if R-001 -> R-002 edge exists)
     alert2 = {
         "id": "test-2",
-        "ts": (now + timedelta(minutes=5)).isoformat(),
+        "ts": NOW_PLUS_5M_ISO,
         "entity_id": "host-1",
         "rule_id": "R-002",
         "severity": "low"
     }
     
+    # Both in one request and one commit; decisions are still made in order
     response = client.post(
-        "/v1/ingest",
-        json=alert2,
-        headers={"X-API-Key": TEST_API_KEY}
+        "/v1/ingest/batch",
+        json={"alerts": [alert1, alert2], "process": True},
+        headers=AUTH_HEADERS
     )
     assert response.status_code == 200
+    data = response.json()
+    assert data["errors"] == 0
+    assert [r["alert_id"] for r in data["results"]] == ["test-1", "test-2"]
+    assert all(r["decision"] in ("deliver", "suppress") for r in data["results"])
     
     # Get condensed view
     response = client.get(
         "/v1/alerts?view=condensed",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -128,12 +167,13 @@ def test_list_alerts_condensed():
     assert "items" in data
     assert data["view"] == "condensed"
 
-def test_explain_decision():
+@pytest.mark.usefixtures("db_session")
+def test_explain_decision(client):
     """Test decision explanation"""
     # Ingest an alert
     alert_data = {
         "id": "explain-test",
-        "ts": datetime.utcnow().isoformat(),
+        "ts": NOW_ISO,
         "entity_id": "test-host",
         "rule_id": "TEST-EXPLAIN",
         "severity": "critical"
@@ -142,14 +182,14 @@ def test_explain_decision():
     response = client.post(
         "/v1/ingest",
         json=alert_data,
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     assert response.status_code == 200
     
     # Get explanation
     response = client.get(
         "/v1/alerts/explain-test/explain",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -158,8 +198,9 @@ def test_explain_decision():
     assert "decision" in data
     assert data["decision"]["type"] in ["deliver", "suppress"]
 
-def test_api_key_authentication():
-    """Test API key authentication"""
+@pytest.mark.usefixtures("no_db")
+def test_api_key_authentication(client):
+    """Requests without a valid API key are rejected before any DB access"""
     # No API key
     response = client.get("/v1/alerts")
     assert response.status_code == 401
@@ -170,34 +211,35 @@ def test_api_key_authentication():
         headers={"X-API-Key": "invalid-key"}
     )
     assert response.status_code == 401
-    
-    # Valid API key
+
+@pytest.mark.usefixtures("db_session")
+def test_api_key_accepted(client):
+    """A valid API key reaches the handler"""
     response = client.get(
         "/v1/alerts",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     assert response.status_code == 200
 
-def test_batch_ingest():
+@pytest.mark.usefixtures("db_session")
+def test_batch_ingest(client):
     """Test batch alert ingestion"""
-    now = datetime.utcnow()
-    
     batch_data = {
         "alerts": [
             {
-                "ts": now.isoformat(),
+                "ts": NOW_ISO,
                 "entity_id": "host-1",
                 "rule_id": "BATCH-001",
                 "severity": "low"
             },
             {
-                "ts": (now + timedelta(minutes=1)).isoformat(),
+                "ts": NOW_PLUS_1M_ISO,
                 "entity_id": "host-2",
                 "rule_id": "BATCH-002",
                 "severity": "medium"
             },
             {
-                "ts": (now + timedelta(minutes=2)).isoformat(),
+                "ts": NOW_PLUS_2M_ISO,
                 "entity_id": "host-3",
                 "rule_id": "BATCH-003",
                 "severity": "high"
@@ -209,7 +251,7 @@ def test_batch_ingest():
     response = client.post(
         "/v1/ingest/batch",
         json=batch_data,
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -218,11 +260,12 @@ def test_batch_ingest():
     assert data["processed"] == 3
     assert data["errors"] == 0
 
-def test_stats_endpoint():
+@pytest.mark.usefixtures("db_session")
+def test_stats_endpoint(client):
     """Test statistics endpoint"""
     response = client.get(
         "/v1/alerts/stats",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -231,11 +274,12 @@ def test_stats_endpoint():
     assert "late_replay" in data
     assert "validation" in data
 
-def test_late_replay():
+@pytest.mark.usefixtures("db_session")
+def test_late_replay(client):
     """Test late replay endpoint"""
     response = client.get(
         "/v1/alerts/late",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
@@ -244,11 +288,12 @@ def test_late_replay():
     assert "items" in data
     assert data["meta"]["late_delivery"] is True
 
-def test_delta_view():
+@pytest.mark.usefixtures("db_session")
+def test_delta_view(client):
     """Test delta view of alerts"""
     response = client.get(
         "/v1/alerts?view=delta",
-        headers={"X-API-Key": TEST_API_KEY}
+        headers=AUTH_HEADERS
     )
     
     assert response.status_code == 200
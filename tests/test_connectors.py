@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import pytest
+
 from bolcd.connectors.normalize import normalize_event_to_logical
 from bolcd.connectors.splunk import SplunkConnector
 from bolcd.connectors.sentinel import SentinelConnector
 from bolcd.connectors.opensearch import OpenSearchConnector
-from bolcd.connectors.sigma import load_sigma_yaml, parse_sigma_to_events
 
 
 def test_normalize_event_to_logical():
@@ -28,8 +29,15 @@ def test_normalize_event_to_logical():
 
 class FakeResp:
     def __init__(self, payload, status_code: int = 200):
+        import json as _json
+
         self._payload = payload
         self.status_code = status_code
+        # Serialized once; connectors may read .text repeatedly
+        if isinstance(payload, (dict, list)):
+            self._text = _json.dumps(payload)
+        else:
+            self._text = str(payload)
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -41,11 +49,7 @@ class FakeResp:
 
     @property
     def text(self):
-        import json as _json
-
-        if isinstance(self._payload, (dict, list)):
-            return "\n".join([_json.dumps(self._payload)])
-        return str(self._payload)
+        return self._text
 
 
 class FakeClient:
@@ -63,36 +67,49 @@ class FakeClient:
         return FakeResp({})
 
 
-def test_connectors_ingest_and_writeback_stubs():
+# (factory, fake payload, query, expected ingested rows), one connector built per module
+CONNECTOR_CASES = {
     # Splunk ingest expects list or {results: []}
-    splunk = SplunkConnector("http://splunk", "tkn", client=FakeClient(payload=[{"a": 1}]))
-    assert list(splunk.ingest("index=main")) == [{"a": 1}]
-    assert splunk.writeback([{"name": "r1", "spl": "index=main | head 1"}])["written"] == 1
-
+    "splunk": (
+        lambda client: SplunkConnector("http://splunk", "tkn", client=client),
+        [{"a": 1}],
+        "index=main",
+        [{"a": 1}],
+    ),
     # Sentinel flatten tables
-    sentinel_payload = {"tables": [{"columns": [{"name": "a"}], "rows": [[1], [2]]}]}
-    sentinel = SentinelConnector("ws", "tkn", client=FakeClient(payload=sentinel_payload))
-    assert [r["a"] for r in sentinel.ingest("KQL") ] == [1, 2]
-
+    "sentinel": (
+        lambda client: SentinelConnector("ws", "tkn", client=client),
+        {"tables": [{"columns": [{"name": "a"}], "rows": [[1], [2]]}]},
+        "KQL",
+        [{"a": 1}, {"a": 2}],
+    ),
     # OpenSearch returns _source list
-    os_payload = {"hits": {"hits": [{"_source": {"x": 1}}, {"_source": {"x": 2}}]}}
-    os_conn = OpenSearchConnector("http://os", {"basic": "abc"}, client=FakeClient(payload=os_payload))
-    assert [r["x"] for r in os_conn.ingest({"query": {"match_all": {}}})] == [1, 2]
-
-def test_sigma_parse(tmp_path):
-    y = tmp_path / "r.yml"
-    y.write_text(
-        """
-title: Example
-detection:
-  sel:
-    ps_exec_count: 1
-  condition: sel
-timeframe: 5m
-        """,
-        encoding="utf-8",
-    )
-    data = load_sigma_yaml(str(y))
-    sr = parse_sigma_to_events(data)
+    "opensearch": (
+        lambda client: OpenSearchConnector("http://os", {"basic": "abc"}, client=client),
+        {"hits": {"hits": [{"_source": {"x": 1}}, {"_source": {"x": 2}}]}},
+        {"query": {"match_all": {}}},
+        [{"x": 1}, {"x": 2}],
+    ),
+}
+
+
+@pytest.fixture(scope="module", params=list(CONNECTOR_CASES))
+def connector_case(request):
+    factory, payload, query, expected = CONNECTOR_CASES[request.param]
+    return factory(FakeClient(payload=payload)), query, expected
+
+
+def test_connectors_ingest_stubs(connector_case):
+    connector, query, expected = connector_case
+    assert list(connector.ingest(query)) == expected
+
+
+def test_splunk_writeback_stub():
+    factory, payload, _query, _expected = CONNECTOR_CASES["splunk"]
+    splunk = factory(FakeClient(payload=payload))
+    assert splunk.writeback([{"name": "r1", "spl": "index=main | head 1"}])["written"] == 1
+
+def test_sigma_parse(sigma_sample):
+    sr = sigma_sample
     assert "ps_exec_count" in sr.fields
     assert sr.condition == "sel"
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
+import pytest
+from xml.etree import ElementTree
+
 from bolcd.io.jsonl import read_jsonl
-from bolcd.ui.graph_export import to_graphml
+from bolcd.ui.graph_export import iter_graphml, to_graphml, write_graph_files
 
 
 def test_read_jsonl(tmp_path: Path):
@@ -13,7 +17,76 @@ def test_read_jsonl(tmp_path: Path):
     assert rows[0]["a"] == 1 and "b" in rows[2]
 
 
+def test_read_jsonl_accepts_what_json_accepts(tmp_path: Path):
+    p = tmp_path / "e.jsonl"
+    p.write_bytes('{"v": NaN}\n\n{"big": 18446744073709551616}\n{"s": "\u00e9"}\n'.encode("utf-8"))
+    rows = list(read_jsonl(p))
+    assert rows[0]["v"] != rows[0]["v"]  # NaN
+    assert rows[1]["big"] == 2 ** 64
+    assert rows[2]["s"] == "\u00e9"
+
+
 def test_to_graphml_minimal():
     g = {"nodes": ["X", "Y"], "edges": [{"src": "X", "dst": "Y", "n_src1": 1, "k_counterex": 0, "ci95_upper": 3.0, "q_value": None}]}
     xml = to_graphml(g)
     assert "<graphml" in xml and "<edge" in xml and "key=\"d0\"" in xml
+
+
+def test_to_graphml_parses_with_namespace():
+    g = {"nodes": ["X", "Y"], "edges": [{"src": "X", "dst": "Y", "n_src1": 4, "k_counterex": 1, "ci95_upper": 0.5, "q_value": 0.01}]}
+    root = ElementTree.fromstring(to_graphml(g))
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    assert root.tag == "{http://graphml.graphdrawing.org/xmlns}graphml"
+    assert [k.get("attr.name") for k in root.findall("g:key", ns)] == ["n_src1", "k_counterex", "ci95_upper", "q_value"]
+    assert [n.get("id") for n in root.findall("g:graph/g:node", ns)] == ["X", "Y"]
+    edge = root.find("g:graph/g:edge", ns)
+    assert (edge.get("source"), edge.get("target")) == ("X", "Y")
+    assert [d.text for d in edge.findall("g:data", ns)] == ["4", "1", "0.5", "0.01"]
+
+
+def test_streamed_graphml_matches_to_graphml(tmp_path: Path, monkeypatch):
+    from bolcd.ui import graph_export
+
+    monkeypatch.setattr(graph_export, "GRAPHML_CHUNK_EDGES", 2)
+    g = {
+        "nodes": ['A&"B"', "<C>"],
+        "edges": [
+            {"src": 'A&"B"', "dst": "<C>", "n_src1": i, "k_counterex": 0, "ci95_upper": 0.1, "q_value": None}
+            for i in range(5)
+        ],
+    }
+    chunks = list(iter_graphml(g))
+    assert len(chunks) == 3 and "".join(chunks) == to_graphml(g)
+    paths = write_graph_files(g, tmp_path)
+    root = ElementTree.parse(paths["graphml"]).getroot()
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    assert [n.get("id") for n in root.findall("g:graph/g:node", ns)] == g["nodes"]
+    edges = root.findall("g:graph/g:edge", ns)
+    assert [e.get("id") for e in edges] == [f"e{i}" for i in range(5)]
+    assert {(e.get("source"), e.get("target")) for e in edges} == {('A&"B"', "<C>")}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_graph_files_json(tmp_path: Path, monkeypatch, use_orjson):
+    from bolcd.ui import graph_export
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(graph_export, "ORJSON_AVAILABLE", use_orjson)
+    g = {"nodes": ["Ä", "B"], "edges": [{"src": "Ä", "dst": "B", "n_src1": 3, "k_counterex": 0, "ci95_upper": 0.25, "q_value": None}]}
+    paths = write_graph_files(g, tmp_path)
+    text = paths["json"].read_text(encoding="utf-8")
+    assert json.loads(text) == g and "Ä" in text
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_graph_files_json_non_finite_as_null(tmp_path: Path, monkeypatch, use_orjson):
+    from bolcd.ui import graph_export
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(graph_export, "ORJSON_AVAILABLE", use_orjson)
+    edge = {"src": "A", "dst": "B", "n_src1": 0, "k_counterex": 0, "ci95_upper": float("inf"), "q_value": float("nan")}
+    paths = write_graph_files({"nodes": ["A", "B"], "edges": [edge]}, tmp_path)
+    loaded = json.loads(paths["json"].read_text(encoding="utf-8"), parse_constant=pytest.fail)
+    assert loaded["edges"][0]["ci95_upper"] is None and loaded["edges"][0]["q_value"] is None
@@ -1,5 +1,11 @@
 from __future__ import annotations
 
+import random
+
+import pytest
+
+from bolcd.core import pipeline
+from bolcd.core.binarization import NUMPY_AVAILABLE
 from bolcd.core.pipeline import (
     generate_synthetic_events,
     learn_graphs_by_segments,
@@ -25,6 +31,15 @@ def test_learn_graph_and_tr():
     assert ("X", "Z") not in edges
 
 
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+def test_columnar_events_match_rows():
+    metrics = ["X", "Y", "Z", "W"]
+    kwargs = dict(thresholds={m: 0.5 for m in metrics}, margin_delta=0.0, fdr_q=0.01, epsilon=0.02)
+    rows = learn_graph_from_events(events=generate_synthetic_events(metrics, n=301), **kwargs)
+    cols = learn_graph_from_events(events=pipeline.generate_synthetic_columns(metrics, n=301), **kwargs)
+    assert cols == rows
+
+
 def test_learn_graph_by_segment_splits_graphs():
     events = [
         {"X": 1.0, "Y": 1.0, "seg": "A"},
@@ -48,3 +63,29 @@ def test_learn_graph_by_segment_splits_graphs():
     assert "A" in seg_keys and "B" in seg_keys
     # Each segment has its own nodes/edges
     assert isinstance(next(iter(result["segments"].values())), dict)
+
+
+def test_segment_slicing_matches_per_bucket_learning(monkeypatch):
+    rng = random.Random(0)
+    metrics = ["X", "Y", "Z"]
+    events = [
+        {**{m: float(rng.random() < 0.6) for m in metrics if rng.random() > 0.05},
+         "seg": rng.choice("ABC"), "zone": rng.choice([1, 2, None])}
+        for _ in range(400)
+    ]
+    kwargs = dict(
+        events=events,
+        thresholds={m: 0.5 for m in metrics},
+        margin_delta=0.0,
+        fdr_q=0.05,
+        epsilon=0.3,
+        segment_by=["seg", "zone"],
+    )
+    sliced = learn_graphs_by_segments(**kwargs)
+    monkeypatch.setattr(pipeline, "NUMPY_AVAILABLE", False)
+    grouped = learn_graphs_by_segments(**kwargs)
+
+    assert list(sliced["segments"]) == list(grouped["segments"])
+    for key, g in grouped["segments"].items():
+        assert sliced["segments"][key]["edges"] == g["edges"]
+        assert sliced["segments"][key]["edges_pre_tr"] == g["edges_pre_tr"]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from bolcd.audit.store import JSONLAuditStore
+
+
+def test_tail_returns_last_entries_in_order(tmp_path):
+    store = JSONLAuditStore(tmp_path / "audit.jsonl")
+    assert store.tail(5) == []
+    for i in range(10):
+        store.append("op", "recompute", {"n": i})
+    assert [e["diff"]["n"] for e in store.tail(3)] == [7, 8, 9]
+    assert len(store.tail(100)) == 10
+    assert store.tail(0) == []
+
+
+def test_tail_skips_blank_and_corrupt_lines(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    path.write_text('{"action": "a"}\n\nnot json\n{"action": "b"}')
+    store = JSONLAuditStore(path)
+    assert [e["action"] for e in store.tail(5)] == ["a", "b"]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from bolcd.core import binarize_events
+import random
+
+from bolcd.core import binarization, binarize_events
+from bolcd.core.binarization import _binarize_python
 
 
 def test_binarization_delta_and_unknown():
@@ -22,3 +25,26 @@ def test_binarization_delta_and_unknown():
     assert (v & (1 << 1)) and (v & (1 << 3))
     # unknown at exact threshold and missing
     assert (u & (1 << 4)) and (u & (1 << 5))
+
+
+def test_binarization_matches_python_reference():
+    rng = random.Random(0)
+    metrics = ["a", "b", "c"]
+    # 200 events crosses several 64-bit words; ~10% of values are missing
+    events = [
+        {m: rng.random() for m in metrics if rng.random() > 0.1}
+        for _ in range(200)
+    ]
+    thresholds = {"a": 0.5, "b": 0.2, "c": 0.9}
+    expected = _binarize_python(events, metrics, thresholds, 0.05)
+    assert binarize_events(events, thresholds, margin_delta=0.05) == expected
+
+
+def test_binarization_accepts_columns(monkeypatch):
+    events = [{"a": 0.0, "b": 0.9}, {"a": 0.7, "b": None}, {"a": 0.5, "b": 0.1}]
+    columns = {"a": [0.0, 0.7, 0.5], "b": [0.9, None, 0.1]}
+    thresholds = {"a": 0.5, "b": 0.5, "c": 0.5}
+    expected = _binarize_python(events, list(thresholds), thresholds, 0.01)
+    assert binarize_events(columns, thresholds, margin_delta=0.01) == expected
+    monkeypatch.setattr(binarization, "NUMPY_AVAILABLE", False)
+    assert binarize_events(columns, thresholds, margin_delta=0.01) == expected
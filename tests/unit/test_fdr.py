@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import random
+
 from bolcd.core import bh_qvalues
+from bolcd.core import fdr
 
 
 def test_bh_monotonicity_and_bounds():
@@ -12,3 +15,13 @@ def test_bh_monotonicity_and_bounds():
         assert qs[i] >= qs[i - 1] - 1e-12
     # clamp [0,1]
     assert all(0.0 <= q <= 1.0 for q in qs)
+
+
+def test_bh_numpy_matches_python(monkeypatch):
+    rng = random.Random(0)
+    # unsorted, with ties and both bounds
+    ps = [rng.random() ** 3 for _ in range(200)] + [0.0, 1.0, 0.5, 0.5]
+    rng.shuffle(ps)
+    fast = bh_qvalues(ps)
+    monkeypatch.setattr(fdr, "NUMPY_AVAILABLE", False)
+    assert fast == bh_qvalues(ps)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import random
+
 from bolcd.core import binarize_events
+from bolcd.core import implication
 from bolcd.core.implication import compute_all_edges
 
 
@@ -24,3 +27,21 @@ def test_implication_counterexamples_and_rule_of_three():
     # For B->A, k may be 0; if so, ci95_upper = 3/n_src1
     if e[("B", "A")].k_counterex == 0:
         assert abs(e[("B", "A")].ci95_upper - 3.0 / e[("B", "A")].n_src1) < 1e-9
+
+
+def test_pair_counts_numpy_matches_python(monkeypatch):
+    rng = random.Random(0)
+    names = ["A", "B", "C", "D"]
+    # 150 events spans three 64-bit words; some values missing -> unknown bits
+    events = [{m: rng.random() for m in names if rng.random() > 0.1} for _ in range(150)]
+    vals, unknowns = binarize_events(events, {m: 0.5 for m in names}, 0.05)
+
+    fast = implication._pair_counts(vals, unknowns)
+    monkeypatch.setattr(implication, "NUMPY_AVAILABLE", False)
+    assert fast == implication._pair_counts(vals, unknowns)
+    # and both agree with the per-pair definition
+    n_src, k = fast
+    for i in range(len(names)):
+        assert n_src[i] == implication.popcount(vals[i] & ~unknowns[i])
+        for j in range(len(names)):
+            assert k[i][j] == implication.compute_counterexamples(vals[i], vals[j], unknowns[j])
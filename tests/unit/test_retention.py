@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import errno
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from bolcd.models.condense import Alert, Base
+from bolcd.retention import policy as policy_module
+from bolcd.retention.policy import DataType, RetentionManager, RetentionPeriod
+
+
+def _manager(tmp_path, config):
+    return RetentionManager(config_file=str(config), database_url="", storage_path=str(tmp_path / "data"))
+
+
+def _db_manager(tmp_path, alerts):
+    """Manager on a SQLite file with the real schema and the given (id, ts) alerts"""
+    mgr = RetentionManager(
+        config_file=str(tmp_path / "missing.yaml"),
+        database_url=f"sqlite:///{tmp_path / 'retention.db'}",
+        storage_path=str(tmp_path / "data"),
+    )
+    Base.metadata.create_all(bind=mgr.engine)
+    with Session(mgr.engine) as session:
+        session.add_all(Alert(id=i, ts=ts, entity_id="host", rule_id="R-1") for i, ts in alerts)
+        session.commit()
+    return mgr
+
+
+def test_config_reloaded_when_file_changes(tmp_path):
+    config = tmp_path / "retention.yaml"
+    config.write_text("retention_policies:\n  metrics:\n    retention_days: 30\n")
+    assert _manager(tmp_path, config).policies[DataType.METRICS].retention_period == RetentionPeriod.DAYS_30
+
+    config.write_text("retention_policies:\n  metrics:\n    retention_days: 180\n")
+    st = config.stat()
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert _manager(tmp_path, config).policies[DataType.METRICS].retention_period == RetentionPeriod.DAYS_180
+
+
+def test_clean_alerts_deletes_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOLCD_DELETE_BATCH_SIZE", "2")
+    old = [(f"old-{i}", datetime(2000, 1, 1)) for i in range(5)]
+    mgr = _db_manager(tmp_path, old + [("new", datetime(2100, 1, 1))])
+    deletes = []
+
+    @event.listens_for(mgr.engine, "after_cursor_execute")
+    def _count_deletes(conn, cursor, statement, *args):
+        if statement.startswith("DELETE"):
+            deletes.append(cursor.rowcount)
+
+    cutoff = datetime(2020, 1, 1)
+    assert mgr._clean_alerts(cutoff, dry_run=True, archive=False) == 5
+    assert mgr._clean_alerts(cutoff, dry_run=False, archive=False) == 5
+    assert deletes == [2, 2, 1]
+    with mgr.engine.connect() as conn:
+        assert [r[0] for r in conn.execute(text("SELECT id FROM alerts"))] == ["new"]
+
+
+def test_alerts_ts_index_ensured_on_real_schema(tmp_path, caplog):
+    mgr = _db_manager(tmp_path, [])
+    with mgr.engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_alerts_ts"))
+
+    with caplog.at_level(logging.WARNING, logger="bolcd.retention.policy"):
+        assert mgr._clean_alerts(datetime(2020, 1, 1), dry_run=True, archive=False) == 0
+    assert caplog.records == []
+    with mgr.engine.connect() as conn:
+        indexes = [r[1] for r in conn.execute(text("PRAGMA index_list('alerts')"))]
+    assert "ix_alerts_ts" in indexes
+
+
+def test_expired_files_and_storage_usage(tmp_path):
+    mgr = _manager(tmp_path, tmp_path / "missing.yaml")
+    metrics = tmp_path / "data" / "metrics"
+    (metrics / "nested").mkdir(parents=True)
+    for name in ("old.json", "new.json", "old.txt"):
+        (metrics / name).write_text("{}")
+    (metrics / "nested" / "inner.json").write_text("[]")
+    os.utime(metrics / "old.json", (0, 0))
+    os.utime(metrics / "old.txt", (0, 0))
+
+    cutoff = datetime(2000, 1, 1)
+    assert mgr._clean_metrics(cutoff, dry_run=True, archive=False) == 1
+    assert mgr.get_retention_status()["storage_usage"]["metrics"]["size_bytes"] == 8
+    assert mgr._clean_metrics(cutoff, dry_run=False, archive=False) == 1
+    assert sorted(p.name for p in metrics.iterdir()) == ["nested", "new.json", "old.txt"]
+
+
+def test_archive_database_records_streams_gzip_jsonl(tmp_path):
+    mgr = _db_manager(tmp_path, [("old", datetime(2000, 1, 1)), ("new", datetime(2100, 1, 1))])
+
+    assert mgr._clean_alerts(datetime(2020, 1, 1), dry_run=False, archive=True) == 1
+    archive = mgr.archive_path / "alerts_20200101.jsonl.gz"
+    with gzip.open(archive, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert [r["id"] for r in rows] == ["old"]
+
+
+def test_apply_retention_policies_dry_run(tmp_path):
+    mgr = _manager(tmp_path, tmp_path / "missing.yaml")
+    tmp_dir = tmp_path / "data" / "tmp"
+    tmp_dir.mkdir(parents=True)
+    (tmp_dir / "stale.txt").write_text("x")
+    os.utime(tmp_dir / "stale.txt", (0, 0))
+    mgr.policies = {DataType.TEMPORARY: mgr.policies[DataType.TEMPORARY]}
+
+    results = mgr.apply_retention_policies(dry_run=True)
+    assert results["errors"] == []
+    assert results["deleted"] == {"temporary": 1}
+    assert (tmp_dir / "stale.txt").exists()
+
+
+def test_archived_files_are_moved_and_large_ones_compressed(tmp_path):
+    mgr = _manager(tmp_path, tmp_path / "missing.yaml")
+    reports = tmp_path / "data" / "reports"
+    reports.mkdir(parents=True)
+    (reports / "small.json").write_text("{}")
+    (reports / "large.json").write_bytes(b"x" * (2 * 1024 * 1024))
+    for name in ("small.json", "large.json"):
+        os.utime(reports / name, (0, 0))
+    policy = mgr.policies[DataType.REPORTS]
+    policy.archive_before_delete = True
+    policy.retention_period = RetentionPeriod.DAYS_30
+    mgr.policies = {DataType.REPORTS: policy}
+
+    results = mgr.apply_retention_policies()
+    assert results["errors"] == []
+    assert results["deleted"] == {"reports": 2}
+    assert list(reports.iterdir()) == []
+    archived = sorted(p.name for p in mgr.archive_path.rglob("*") if p.is_file())
+    assert archived == ["large.json.gz", "small.json"]
+
+
+def test_archive_file_falls_back_to_copy_across_filesystems(tmp_path, monkeypatch):
+    mgr = _manager(tmp_path, tmp_path / "missing.yaml")
+    src = tmp_path / "audit.jsonl"
+    src.write_text("{}\n")
+    os.utime(src, (0, 0))
+
+    def cross_device_rename(a, b):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "rename", cross_device_rename)
+    mgr._archive_file(src)
+
+    assert not src.exists()
+    moved = next(p for p in mgr.archive_path.rglob("audit.jsonl"))
+    assert moved.read_text() == "{}\n"
+    assert moved.stat().st_mtime == 0
+
+
+def test_storage_usage_cached_until_directory_changes(tmp_path):
+    mgr = _manager(tmp_path, tmp_path / "missing.yaml")
+    reports = tmp_path / "data" / "reports"
+    reports.mkdir(parents=True)
+    (reports / "a.json").write_text("1234")
+
+    def usage():
+        return mgr.get_retention_status()["storage_usage"]["reports"]["size_bytes"]
+
+    assert usage() == 4
+    (reports / "a.json").write_text("12345678")
+    assert usage() == 4  # same directory entries, served from cache
+
+    (reports / "b.json").write_text("12")
+    st = reports.stat()
+    os.utime(reports, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert usage() == 10
+
+
+def test_archive_line_format_does_not_depend_on_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    record = {
+        "id": "ä-1",
+        "ts": datetime(2025, 1, 1),
+        "seen": datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc),
+        "day": date(2025, 1, 2),
+        "attrs": {"n": 1, "score": 0.5},
+    }
+    with_orjson = policy_module._json_line(record)
+    monkeypatch.setattr(policy_module, "ORJSON_AVAILABLE", False)
+    assert policy_module._json_line(record) == with_orjson
+    assert json.loads(with_orjson)["ts"] == "2025-01-01 00:00:00"
@@ -14,3 +14,17 @@ def test_build_suppression_rules_basic():
     rules = build_suppression_rules(g)
     assert any(r["detector"]["via"] == "B" and r["detector"]["src"] == "A" and r["detector"]["dst"] == "C" for r in rules)
 
+
+def test_build_suppression_rules_one_rule_per_pair():
+    g = {
+        "edges": [
+            {"src": "A", "dst": "B1"},
+            {"src": "A", "dst": "B2"},
+            {"src": "B1", "dst": "C"},
+            {"src": "B2", "dst": "C"},
+            {"src": "A", "dst": "C"},
+        ]
+    }
+    rules = build_suppression_rules(g)
+    assert [r["name"] for r in rules] == ["bolcd_suppress_A_C___all__"]
+    assert rules[0]["detector"]["via"] == "B1"
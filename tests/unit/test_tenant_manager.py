@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import asdict
+
+import pytest
+
+from bolcd.tenant import manager as manager_module
+from bolcd.tenant.manager import TenantConfig, TenantContext, TenantIsolation, TenantManager
+
+
+def test_tenants_persist_across_reload(tmp_path):
+    mgr = TenantManager(data_dir=tmp_path)
+    acme = mgr.create_tenant("acme", "Acme Corp", max_rules=5)
+    other = mgr.create_tenant("other", "Other Inc")
+    mgr.update_tenant(acme.tenant_id, settings={"tz": "UTC"})
+    mgr.add_siem_config(acme.tenant_id, "splunk", {"url": "https://splunk", "token": "secret"})
+    mgr.delete_tenant(other.tenant_id, hard_delete=True)
+    mgr.flush()
+
+    reloaded = TenantManager(data_dir=tmp_path)
+    assert list(reloaded.tenants) == [acme.tenant_id]
+    tenant = reloaded.get_tenant(acme.tenant_id)
+    assert tenant.max_rules == 5
+    assert tenant.settings == {"tz": "UTC"}
+    assert tenant.siem_configs[0]["config"]["token"] == "***encrypted***"
+
+
+def test_change_log_compacts_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(manager_module, "COMPACT_THRESHOLD_BYTES", 0)
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp")
+    mgr.flush()
+
+    assert (tmp_path / "tenants.log.jsonl").stat().st_size == 0
+    reloaded = TenantManager(data_dir=tmp_path)
+    assert reloaded.get_tenant(tenant.tenant_id).name == "acme"
+
+
+def test_mutations_are_coalesced_into_one_append(tmp_path):
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp")
+    for i in range(10):
+        mgr.update_tenant(tenant.tenant_id, max_rules=i)
+    mgr.flush()
+
+    lines = (tmp_path / "tenants.log.jsonl").read_bytes().splitlines()
+    assert len(lines) == 1
+    assert TenantManager(data_dir=tmp_path).get_tenant(tenant.tenant_id).max_rules == 9
+
+
+def test_concurrent_updates_are_all_recorded(tmp_path):
+    mgr = TenantManager(data_dir=tmp_path)
+    tenants = [mgr.create_tenant(f"t{i}", "Org") for i in range(8)]
+
+    def bump(tenant):
+        for n in range(50):
+            mgr.update_tenant(tenant.tenant_id, max_rules=n)
+
+    threads = [threading.Thread(target=bump, args=(t,)) for t in tenants]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    mgr.flush()
+
+    reloaded = TenantManager(data_dir=tmp_path)
+    assert [reloaded.get_tenant(t.tenant_id).max_rules for t in tenants] == [49] * 8
+
+
+def test_check_quota_reuses_usage_until_ttl_expires(tmp_path, monkeypatch):
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp", max_rules=10)
+    usage_file = tmp_path / tenant.tenant_id / "usage.json"
+    usage_file.write_text('{"rules": 9}')
+    assert mgr.check_quota(tenant.tenant_id, "rules")
+
+    usage_file.write_text('{"rules": 10}')
+    assert mgr.check_quota(tenant.tenant_id, "rules")  # cached
+
+    monkeypatch.setattr(manager_module, "USAGE_CACHE_TTL_SECONDS", 0)
+    assert not mgr.check_quota(tenant.tenant_id, "rules")
+    mgr.flush()
+
+
+def test_tenant_encryption_roundtrip():
+    fernet = pytest.importorskip("cryptography.fernet")
+    token = TenantIsolation.encrypt_tenant_data(b"payload", "tenant-a")
+    assert TenantIsolation.decrypt_tenant_data(token, "tenant-a") == b"payload"
+    with pytest.raises(fernet.InvalidToken):
+        TenantIsolation.decrypt_tenant_data(token, "tenant-b")
+    assert manager_module._fernet_for("tenant-a") is manager_module._fernet_for("tenant-a")
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_snapshot_loads_with_and_without_ijson(tmp_path, monkeypatch, use_ijson):
+    if use_ijson:
+        pytest.importorskip("ijson")
+    monkeypatch.setattr(manager_module, "IJSON_AVAILABLE", use_ijson)
+    monkeypatch.setattr(manager_module, "MSGPACK_AVAILABLE", False)
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp", settings={"ratio": 0.5})
+    mgr.flush()
+    mgr._compact()
+
+    reloaded = TenantManager(data_dir=tmp_path)
+    assert reloaded.get_tenant(tenant.tenant_id).settings == {"ratio": 0.5}
+
+
+def test_msgpack_snapshot_replaces_json_and_exports(tmp_path, monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(manager_module, "MSGPACK_AVAILABLE", False)
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp", settings={"ratio": 0.5})
+    mgr.flush()
+    mgr._compact()
+    assert (tmp_path / "tenants.json").exists()
+
+    monkeypatch.setattr(manager_module, "MSGPACK_AVAILABLE", True)
+    mgr._compact()
+    assert (tmp_path / "tenants.msgpack").exists()
+    assert not (tmp_path / "tenants.json").exists()
+
+    reloaded = TenantManager(data_dir=tmp_path)
+    assert reloaded.get_tenant(tenant.tenant_id).settings == {"ratio": 0.5}
+    exported = json.loads(reloaded.export_json().read_text())
+    assert exported["tenants"][0]["tenant_id"] == tenant.tenant_id
+
+
+def test_to_dict_matches_asdict():
+    tenant = TenantConfig(tenant_id="t", name="n", organization="o", created_at="c", updated_at="u")
+    assert tenant.to_dict() == asdict(tenant)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_serializes_tenant_config(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(manager_module, "ORJSON_AVAILABLE", use_orjson)
+    tenant = TenantConfig(tenant_id="t", name="n", organization="o", created_at="c", updated_at="u")
+    assert json.loads(manager_module._json_dumps({"tenants": [tenant]})) == {"tenants": [asdict(tenant)]}
+
+
+def test_limit_for_tracks_updates_and_ignores_unknown_fields(tmp_path):
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp", storage_quota_gb=1)
+    assert tenant.limit_for("storage") == 1024 ** 3
+    assert tenant.limit_for("unknown") == float("inf")
+
+    mgr.update_tenant(tenant.tenant_id, max_rules=5, created_at="hijack")
+    assert tenant.limit_for("rules") == 5
+    assert tenant.created_at != "hijack"
+    mgr.flush()
+
+
+def test_tenant_context_features_and_settings(tmp_path):
+    mgr = TenantManager(data_dir=tmp_path)
+    tenant = mgr.create_tenant("acme", "Acme Corp", settings={"tz": "UTC"})
+    ctx = TenantContext(mgr, tenant.tenant_id)
+    assert ctx.check_feature("api_access") and not ctx.check_feature("sso_integration")
+    assert ctx.get_setting("tz") == "UTC" and ctx.get_setting("missing", 1) == 1
+    mgr.delete_tenant(tenant.tenant_id)
+    with pytest.raises(ValueError):
+        TenantContext(mgr, tenant.tenant_id)
+    mgr.flush()
+
+
+def test_audit_records_written_through_on_each_call(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for i in range(3):
+        TenantIsolation.audit_tenant_access("tenant-a", f"user-{i}", "read", "rules", True)
+
+    audit_path = TenantIsolation.get_isolated_storage_path("tenant-a") / "audit.jsonl"
+    lines = audit_path.read_text().splitlines()
+    assert [json.loads(line)["user_id"] for line in lines] == ["user-0", "user-1", "user-2"]
+    mapped = TenantIsolation.read_audit("tenant-a")
+    assert mapped[:].splitlines() == audit_path.read_bytes().splitlines()
+    mapped.close()
+    assert TenantIsolation.read_audit("tenant-b") is None
+
+    # A rotated log gets a fresh file instead of growing the moved one
+    audit_path.rename(audit_path.with_suffix(".jsonl.1"))
+    TenantIsolation.audit_tenant_access("tenant-a", "user-3", "read", "rules", True)
+    assert [json.loads(line)["user_id"] for line in audit_path.read_text().splitlines()] == ["user-3"]
+    assert len(audit_path.with_suffix(".jsonl.1").read_text().splitlines()) == 3
+    manager_module.close_audit_logs()
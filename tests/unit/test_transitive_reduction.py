@@ -9,3 +9,19 @@ def test_transitive_reduction_redundancy_removed():
     assert ("A", "C") not in set(reduced)
     assert ("A", "B") in set(reduced)
     assert ("B", "C") in set(reduced)
+
+
+def test_transitive_reduction_keeps_diamond_and_drops_long_shortcuts():
+    # A->B->D, A->C->D, D->E plus shortcuts A->D, A->E, B->E
+    edges = [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("D", "E"),
+             ("A", "D"), ("A", "E"), ("B", "E")]
+    reduced = set(transitive_reduction(edges))
+    assert reduced == {("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("D", "E")}
+
+
+def test_transitive_reduction_with_cycle_still_drops_shortcut():
+    # A<->B are mutually implied; A->C is implied by A->B->C
+    edges = [("A", "B"), ("B", "A"), ("B", "C"), ("A", "C")]
+    reduced = set(transitive_reduction(edges))
+    assert ("B", "C") in reduced
+    assert ("A", "C") not in reduced